@@ -3,202 +3,2598 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "pyqt5",
+#     "pulsectl",
 # ]
 # ///
 #!/usr/bin/env python3
-import hashlib
+import time
+
+# Startup milestones for --startup-trace, as (label, end,
+# duration) rows; the first is taken before anything heavy
+# is imported
+_startup_rows = [("start", time.perf_counter(), None)]
+
+import argparse
+import itertools
+import json
 import os
 import re
+import sqlite3
 import sys
 import subprocess
-import tempfile
-import urllib.request
+import threading
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+
+_startup_rows.append(("import stdlib", time.perf_counter(), None))
+
+# The art download stack (http.client, urllib, hashlib,
+# tempfile, concurrent.futures), QtNetwork and pulsectl are
+# imported on first use
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QHBoxLayout, QPushButton, QLabel, QSlider,
     QSizePolicy, QGridLayout, QScrollArea, QFrame,
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtCore import (
+    Qt, QCoreApplication, QEvent, QObject, QTimer, QThread,
+    pyqtSignal, pyqtSlot,
+)
+from PyQt5.QtGui import QFont, QImage, QPixmap
 from PyQt5.QtWidgets import QStyleOptionSlider, QStyle
 
-ART_CACHE_DIR = os.path.join(
-    tempfile.gettempdir(), "media-touchpad-art"
-)
-ART_SIZE = 120
+_startup_rows.append(("import PyQt5", time.perf_counter(), None))
+
+try:
+    from PyQt5.QtDBus import (
+        QDBusConnection, QDBusMessage, QDBusPendingCallWatcher,
+        QDBusPendingReply,
+    )
+    HAS_QTDBUS = True
+except ImportError:
+    HAS_QTDBUS = False
+
+_startup_rows.append(("import QtDBus", time.perf_counter(), None))
+
+# Set by _load_pulsectl(): the module, or False
+pulsectl = None
+
+# Kept out of /tmp so art survives a reboot
+ART_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME")
+    or os.path.expanduser("~/.cache"),
+    "media-touchpad", "art",
+)
+ART_SIZE = 120
+# Player rows have a fixed height so the list can be
+# virtualized: only rows in view exist as widgets
+PLAYER_ROW_HEIGHT = ART_SIZE + 20
+PLAYER_ROW_SPACING = 20
+# Decoded, scaled pixmaps kept in memory
+ART_MEMORY_ITEMS = 64
+# Disk budget for downloaded art and thumbnails
+ART_DISK_BUDGET = 64 * 1024 * 1024
+# Album art download pool
+ART_FETCH_WORKERS = 4
+ART_FETCH_PER_HOST = 2
+ART_FETCH_TIMEOUT = 10
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_IFACE = "org.mpris.MediaPlayer2.Player"
+DBUS_PROPS_IFACE = "org.freedesktop.DBus.Properties"
+
+# Last known UI state, painted before any live data arrives
+STATE_DB_PATH = os.path.join(
+    os.environ.get("XDG_STATE_HOME")
+    or os.path.expanduser("~/.local/state"),
+    "media-touchpad", "state.db",
+)
+# Changes are batched into one write per this interval
+STATE_SAVE_DELAY_MS = 2000
+
+# Outputs the switch button cycles through, in order. A
+# profile's "match" maps sink fields (name, description or
+# any property, e.g. "device.product.name") to substrings;
+# a plain string matches the sink name.
+SINK_CONFIG_PATH = os.path.join(
+    os.environ.get("XDG_CONFIG_HOME")
+    or os.path.expanduser("~/.config"),
+    "media-touchpad", "sinks.json",
+)
+DEFAULT_SINK_PROFILES = [
+    {"name": "speakers", "match": "Modi"},
+    {"name": "phones", "match": "Fulla"},
+]
+# Upper bound on concurrent pactl processes per batch
+PACTL_BATCH = 32
+
+# `daemon` mode: one process owns the models and serves
+# every window, hotkey and status bar over this socket
+DAEMON_SOCKET = (
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], "media-touchpad.sock")
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else f"/tmp/media-touchpad-{os.getuid()}.sock"
+)
+# State pushes to subscribers are coalesced over this window
+DAEMON_PUSH_MS = 50
+# Requests longer than this, or clients this far behind on
+# reading pushes, get disconnected
+DAEMON_MAX_LINE = 64 * 1024
+DAEMON_MAX_BACKLOG = 1024 * 1024
+
+# Polling fallback: each subsystem starts at its fast interval
+# and doubles toward the slow one while nothing changes
+POLL_FAST_MS = 750
+POLL_SLOW_MS = 6000
+SINK_POLL_FAST_MS = 5000
+SINK_POLL_SLOW_MS = 30000
+# Max rate for repeated commands to one target (slider drags)
+CONTROL_RATE_HZ = 20
+# Delay before re-reading state after a command finishes
+SETTLE_MS = 150
+# --profile: ticks kept for the overlay, events kept for export
+PROFILE_WINDOW = 200
+PROFILE_TRACE_EVENTS = 100_000
+
+
+class Profiler:
+    """Timing instrumentation for --profile.
+
+    Records per-tick phase durations, subprocesses spawned on
+    the GUI thread per tick, and latency from a button press
+    to the state update that confirms it. Everything is a
+    no-op until enable() is called."""
+
+    def __init__(self):
+        self.enabled = False
+        self.ticks = deque(maxlen=PROFILE_WINDOW)
+        self.latencies = deque(maxlen=PROFILE_WINDOW)
+        self.trace = deque(maxlen=PROFILE_TRACE_EVENTS)
+        self.total_forks = 0
+        self._tick = None
+        self._tick_forks = 0
+        self._pending: dict[tuple, tuple] = {}
+        self._main_thread = threading.get_ident()
+        self._t0 = time.perf_counter()
+
+    def enable(self):
+        self.enabled = True
+        self._main_thread = threading.get_ident()
+        # subprocess fires this audit event for every spawn
+        sys.addaudithook(self._audit)
+
+    def _audit(self, event, args):
+        if event != "subprocess.Popen":
+            return
+        self.total_forks += 1
+        on_main = threading.get_ident() == self._main_thread
+        if on_main:
+            self._tick_forks += 1
+        argv = args[1] if len(args) > 1 else args[0]
+        if isinstance(argv, (list, tuple)):
+            argv = " ".join(str(a) for a in argv[:3])
+        self._event(
+            "spawn", time.perf_counter(), None,
+            args={"argv": str(argv)},
+        )
+
+    def _event(self, name, start, duration, cat="phase",
+               args=None):
+        ev = {
+            "name": name, "cat": cat,
+            "ts": round((start - self._t0) * 1e6),
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if duration is None:
+            ev["ph"] = "i"
+            ev["s"] = "t"
+        else:
+            ev["ph"] = "X"
+            ev["dur"] = round(duration * 1e6)
+        if args:
+            ev["args"] = args
+        self.trace.append(ev)
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._event(name, start, duration)
+            tick = self._tick
+            if (
+                tick is not None
+                and threading.get_ident() == self._main_thread
+            ):
+                phases = tick["phases"]
+                phases[name] = phases.get(name, 0.0) + duration * 1000
+
+    @contextmanager
+    def tick(self, name):
+        """Time one refresh pass. Nested ticks count as
+        phases of the outer one."""
+        if not self.enabled or self._tick is not None:
+            with self.phase(name):
+                yield
+            return
+        self._tick = {"name": name, "phases": {}}
+        self._tick_forks = 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            tick, self._tick = self._tick, None
+            tick["ms"] = duration * 1000
+            tick["forks"] = self._tick_forks
+            self.ticks.append(tick)
+            self._event(name, start, duration, cat="tick")
+            self.trace.append({
+                "name": "forks", "ph": "C",
+                "ts": round((start - self._t0) * 1e6),
+                "pid": os.getpid(),
+                "args": {"per_tick": tick["forks"]},
+            })
+
+    def action(self, kind, target, done):
+        """Note a user action; `done(value)` says whether an
+        observed value confirms it."""
+        if self.enabled:
+            self._pending[(kind, target)] = (
+                time.perf_counter(), done,
+            )
+
+    def observe(self, kind, target, value):
+        """Report confirmed state; resolves a pending action."""
+        if not self.enabled:
+            return
+        pending = self._pending.get((kind, target))
+        if pending is None or not pending[1](value):
+            return
+        del self._pending[(kind, target)]
+        start = pending[0]
+        latency = time.perf_counter() - start
+        self.latencies.append((kind, latency * 1000))
+        self._event(
+            f"latency:{kind}", start, latency, cat="action",
+            args={"target": str(target)},
+        )
+
+    def summary(self):
+        """Rolling-window stats for the overlay and export."""
+        def pct(values, q):
+            if not values:
+                return 0.0
+            values = sorted(values)
+            return values[min(len(values) - 1, int(q * len(values)))]
+
+        ticks = list(self.ticks)
+        phases: dict[str, list[float]] = {}
+        for t in ticks:
+            for name, ms in t["phases"].items():
+                phases.setdefault(name, []).append(ms)
+        latency: dict[str, list[float]] = {}
+        for kind, ms in self.latencies:
+            latency.setdefault(kind, []).append(ms)
+        tick_ms = [t["ms"] for t in ticks]
+        return {
+            "ticks": len(ticks),
+            "tick_ms": {"p50": pct(tick_ms, 0.5),
+                        "p95": pct(tick_ms, 0.95)},
+            "forks_per_tick": (
+                sum(t["forks"] for t in ticks) / len(ticks)
+                if ticks else 0.0
+            ),
+            "total_forks": self.total_forks,
+            "phases": {
+                name: {"p50": pct(v, 0.5), "p95": pct(v, 0.95)}
+                for name, v in phases.items()
+            },
+            "latency_ms": {
+                kind: {"p50": pct(v, 0.5), "p95": pct(v, 0.95)}
+                for kind, v in latency.items()
+            },
+            "histogram": self.histogram(tick_ms),
+        }
+
+    @staticmethod
+    def histogram(values, edges=(1, 2, 4, 8, 16, 32, 64, 128)):
+        """Counts of tick durations per power-of-two ms bucket."""
+        counts = [0] * (len(edges) + 1)
+        for v in values:
+            i = 0
+            while i < len(edges) and v >= edges[i]:
+                i += 1
+            counts[i] += 1
+        labels = [f"<{edges[0]}"] + [
+            f"{lo}-{hi}" for lo, hi in zip(edges, edges[1:])
+        ] + [f">={edges[-1]}"]
+        return list(zip(labels, counts))
+
+    def export(self, path):
+        """Write a Chrome/Perfetto trace with the summary."""
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": list(self.trace),
+                "displayTimeUnit": "ms",
+                "summary": self.summary(),
+            }, f)
+
+
+profiler = Profiler()
+
+
+class StartupTrace:
+    """Startup timeline printed by --startup-trace: import
+    phases, window construction, first paint and the first
+    live refresh, relative to the top of the script."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.enabled = False
+
+    def mark(self, label):
+        self.rows.append((label, time.perf_counter(), None))
+
+    @contextmanager
+    def span(self, label):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.rows.append((label, end, end - t0))
+
+    def report(self, file=sys.stderr):
+        if not self.enabled:
+            return
+        t0 = self.rows[0][1]
+        prev = t0
+        print("startup trace (ms since start / step):", file=file)
+        for label, end, duration in self.rows[1:]:
+            step = duration if duration is not None else end - prev
+            print(f"  {(end - t0) * 1000:8.1f}  {step * 1000:7.1f}"
+                  f"  {label}", file=file)
+            prev = end
+
+
+startup = StartupTrace(_startup_rows)
+
+
+def _load_pulsectl():
+    """Import pulsectl on first use. Returns False when it
+    (or libpulse) isn't available."""
+    global pulsectl
+    if pulsectl is None:
+        try:
+            with startup.span("import pulsectl (lazy)"):
+                import pulsectl
+        except (ImportError, OSError):
+            # OSError: pulsectl is installed but libpulse isn't
+            pulsectl = False
+    return pulsectl is not False
+
+
+def get_players():
+    """Return list of playerctl player names."""
+    try:
+        result = subprocess.run(
+            ["playerctl", "-l"],
+            capture_output=True, text=True,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip().splitlines()
+    except Exception:
+        pass
+    return []
+
+
+def get_all_metadata():
+    """Parse `playerctl -a metadata` into a dict keyed by
+    player name. Each value is a dict of metadata fields."""
+    try:
+        result = subprocess.run(
+            ["playerctl", "-a", "metadata"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return {}
+    except Exception:
+        return {}
+
+    players: dict[str, dict[str, str]] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        name = parts[0]
+        key = parts[1]
+        value = parts[2] if len(parts) > 2 else ""
+        # Strip namespace prefix (e.g. mpris:, xesam:)
+        short = key.split(":", 1)[-1] if ":" in key else key
+        players.setdefault(name, {})[short] = value
+    return players
+
+
+def get_player_states():
+    """Return {player: (status, volume)} for every player
+    from a single playerctl call. Volume is 0..1 or None."""
+    try:
+        result = subprocess.run(
+            ["playerctl", "-a", "status", "--format",
+             "{{playerInstance}}\t{{status}}\t{{volume}}"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return {}
+    except Exception:
+        return {}
+
+    states: dict[str, tuple[str, float | None]] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) < 2:
+            continue
+        try:
+            volume = float(parts[2])
+        except (IndexError, ValueError):
+            volume = None
+        states[parts[0]] = (parts[1].strip().lower(), volume)
+    return states
+
+
+def _scale_art(image):
+    """Scale a QImage or QPixmap to the art label size."""
+    return image.scaled(
+        ART_SIZE, ART_SIZE,
+        Qt.KeepAspectRatio,
+        Qt.SmoothTransformation,
+    )
+
+
+class ArtCache:
+    """Two-tier album art cache.
+
+    The memory tier is an LRU of scaled QPixmaps keyed by URL
+    and must only be used from the GUI thread. The disk tier
+    holds downloaded originals plus pre-scaled thumbnails
+    next to them, is bounded by `budget` bytes with LRU
+    eviction, and is safe to use from worker threads."""
+    THUMB_SUFFIX = ".thumb.png"
+
+    def __init__(self, directory=ART_CACHE_DIR,
+                 budget=ART_DISK_BUDGET,
+                 max_items=ART_MEMORY_ITEMS):
+        self.directory = directory
+        self.budget = budget
+        self.max_items = max_items
+        self._pixmaps: OrderedDict[str, QPixmap] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- Memory tier (GUI thread) ---
+
+    def get_pixmap(self, url):
+        pm = self._pixmaps.get(url)
+        if pm is not None:
+            self._pixmaps.move_to_end(url)
+        return pm
+
+    def put_pixmap(self, url, pm):
+        self._pixmaps[url] = pm
+        self._pixmaps.move_to_end(url)
+        while len(self._pixmaps) > self.max_items:
+            self._pixmaps.popitem(last=False)
+
+    # --- Disk tier (any thread) ---
+
+    def thumb_path(self, url, download=None):
+        """Return the path of a pre-scaled thumbnail for an
+        http(s) art URL, downloading it if needed, or None.
+        `download(url, path)` defaults to urlretrieve."""
+        original, thumb = self._paths(url)
+        if os.path.isfile(thumb):
+            self._touch(thumb, original)
+            return thumb
+
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.isfile(original):
+            if download is None:
+                import urllib.request
+                download = urllib.request.urlretrieve
+            if not self._write_atomic(
+                original, lambda tmp: download(url, tmp)
+            ):
+                return None
+        image = QImage(original)
+        if image.isNull():
+            # Not an image; don't keep treating it as a hit
+            self._remove(original)
+            return None
+        if not self._write_atomic(
+            thumb, lambda tmp: _scale_art(image).save(tmp, "PNG")
+        ):
+            return None
+        self._evict()
+        return thumb
+
+    def cached_thumb(self, url):
+        """Thumbnail path for `url` if it's on disk already."""
+        thumb = self._paths(url)[1]
+        return thumb if os.path.isfile(thumb) else None
+
+    def _paths(self, url):
+        import hashlib
+
+        h = hashlib.md5(url.encode()).hexdigest()
+        ext = ".png" if ".png" in url else ".jpg"
+        return (
+            os.path.join(self.directory, h + ext),
+            os.path.join(self.directory, h + self.THUMB_SUFFIX),
+        )
+
+    def _write_atomic(self, dest, write):
+        """Write via a temp file in the cache dir and rename,
+        so a crash or failed download never leaves a partial
+        file that later looks like a cache hit."""
+        import tempfile
+
+        fd, tmp = tempfile.mkstemp(
+            dir=self.directory, suffix=".part"
+        )
+        os.close(fd)
+        try:
+            if write(tmp) is False:
+                raise OSError(f"could not write {dest}")
+            os.replace(tmp, dest)
+            return True
+        except Exception:
+            self._remove(tmp)
+            return False
+
+    @staticmethod
+    def _touch(*paths):
+        for path in paths:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries (original and
+        thumbnail together) until under budget."""
+        with self._lock:
+            groups: dict[str, list] = {}
+            total = 0
+            try:
+                entries = list(os.scandir(self.directory))
+            except OSError:
+                return
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(".part"):
+                    # Stale leftovers from an interrupted write
+                    if time.time() - st.st_mtime > 3600:
+                        self._remove(entry.path)
+                    continue
+                key = entry.name.split(".", 1)[0]
+                group = groups.setdefault(key, [0, 0.0, []])
+                group[0] += st.st_size
+                group[1] = max(group[1], st.st_mtime)
+                group[2].append(entry.path)
+                total += st.st_size
+            if total <= self.budget:
+                return
+            for size, _, paths in sorted(
+                groups.values(), key=lambda g: g[1]
+            ):
+                for path in paths:
+                    self._remove(path)
+                total -= size
+                if total <= self.budget:
+                    break
+
+
+class ArtFetchService(QObject):
+    """Shared album art downloader.
+
+    Runs on a fixed worker pool, deduplicates in-flight URLs
+    so every requester shares one download, reuses keep-alive
+    connections per worker and host, caps concurrent requests
+    per host, and drops queued work nobody wants anymore."""
+    fetched = pyqtSignal(str, str)  # url, thumbnail path
+
+    def __init__(self, cache, workers=ART_FETCH_WORKERS,
+                 per_host=ART_FETCH_PER_HOST,
+                 timeout=ART_FETCH_TIMEOUT):
+        super().__init__()
+        self.cache = cache
+        self.timeout = timeout
+        self._per_host = per_host
+        self._workers = workers
+        # Created (and concurrent.futures imported) on the
+        # first request
+        self._pool = None
+        self._lock = threading.Lock()
+        self._inflight = {}  # url -> Future
+        self._waiters: dict[str, set] = {}  # url -> requester ids
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._local = threading.local()
+
+    def request(self, url, requester):
+        """Ask for `url` on behalf of `requester`; the result
+        arrives via the `fetched` signal."""
+        with self._lock:
+            self._waiters.setdefault(url, set()).add(id(requester))
+            if url in self._inflight:
+                return
+            if self._pool is None:
+                with startup.span("import art fetch stack (lazy)"):
+                    from concurrent.futures import ThreadPoolExecutor
+                    import http.client  # noqa: F401
+                    import urllib.parse  # noqa: F401
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._workers,
+                    thread_name_prefix="art-fetch",
+                )
+            future = self._pool.submit(self._fetch, url)
+            self._inflight[url] = future
+        future.add_done_callback(
+            lambda f, u=url: self._on_done(u, f)
+        )
+
+    def release(self, url, requester):
+        """`requester` no longer wants `url`. A download that
+        hasn't started yet is cancelled once nobody wants it."""
+        with self._lock:
+            waiters = self._waiters.get(url)
+            if waiters is None:
+                return
+            waiters.discard(id(requester))
+            if waiters:
+                return
+            future = self._inflight.get(url)
+        # Outside the lock: cancel() runs _on_done inline
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, url, future):
+        # Runs on a worker thread; the signal is queued to
+        # the GUI thread.
+        with self._lock:
+            self._inflight.pop(url, None)
+            self._waiters.pop(url, None)
+        if future.cancelled():
+            return
+        try:
+            path = future.result()
+        except Exception:
+            path = None
+        self.fetched.emit(url, path or "")
+
+    def _fetch(self, url):
+        return self.cache.thumb_path(url, self._download)
+
+    def _host_slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self._per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _connection(self, scheme, host, fresh=False):
+        import http.client
+
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        key = (scheme, host)
+        conn = conns.get(key)
+        if conn is not None and fresh:
+            conn.close()
+            conn = None
+        if conn is None:
+            cls = (
+                http.client.HTTPSConnection if scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conns[key] = cls(host, timeout=self.timeout)
+        return conn
+
+    def _get(self, parts):
+        import http.client
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        with self._host_slot(parts.netloc):
+            for attempt in range(2):
+                # A reused keep-alive socket may have been
+                # closed by the server; retry once on a new one
+                conn = self._connection(
+                    parts.scheme, parts.netloc, fresh=attempt > 0
+                )
+                try:
+                    conn.request("GET", path, headers={
+                        "User-Agent": "media-touchpad",
+                    })
+                    resp = conn.getresponse()
+                    return resp, resp.read()
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    if attempt:
+                        raise
+
+    def _download(self, url, dest, redirects=3):
+        import urllib.parse
+
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise OSError(f"unsupported art URL: {url}")
+        resp, body = self._get(parts)
+        if resp.status in (301, 302, 303, 307, 308) and redirects:
+            location = urllib.parse.urljoin(
+                url, resp.getheader("Location", "")
+            )
+            return self._download(location, dest, redirects - 1)
+        if resp.status != 200:
+            raise OSError(f"HTTP {resp.status} for {url}")
+        with open(dest, "wb") as f:
+            f.write(body)
+
+
+class StateStore(QObject):
+    """Small key -> JSON store in SQLite for state that
+    should outlive the process (saved volumes, last players,
+    sink). Writes are batched on a timer; GUI thread only."""
+
+    def __init__(self, path=STATE_DB_PATH, delay_ms=STATE_SAVE_DELAY_MS):
+        super().__init__()
+        self.path = path
+        self._db = None
+        self._values = {}
+        self._dirty = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+        try:
+            self._open()
+        except sqlite3.DatabaseError as e:
+            print(f"State store {path} unusable, starting fresh: {e}")
+            self._reset()
+
+    def _open(self):
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        for key, value in self._db.execute(
+            "SELECT key, value FROM state"
+        ):
+            try:
+                self._values[key] = json.loads(value)
+            except ValueError:
+                pass
+
+    def _reset(self):
+        if self._db is not None:
+            self._db.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+        self._values = {}
+        try:
+            self._open()
+        except sqlite3.Error as e:
+            print(f"State store disabled: {e}")
+            self._db = None
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        """Remember `value` (JSON-serialisable); written out
+        on the next flush if it changed."""
+        if self._values.get(key) == value:
+            return
+        self._values[key] = value
+        self._dirty.add(key)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self._dirty or self._db is None:
+            return
+        rows = [
+            (key, json.dumps(self._values[key]))
+            for key in self._dirty
+        ]
+        self._dirty.clear()
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO state VALUES (?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            print(f"Saving state failed: {e}")
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _mpris_text(value):
+    """Render an MPRIS metadata value the way playerctl
+    prints it."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+class MprisWatcher(QObject):
+    """In-memory model of MPRIS players, kept current from
+    session bus signals instead of polling playerctl.
+
+    Player names match `playerctl -l` (the bus name without
+    the org.mpris.MediaPlayer2. prefix)."""
+    players_changed = pyqtSignal()
+    player_changed = pyqtSignal(str)  # player_name
+
+    def __init__(self):
+        super().__init__()
+        self._bus = None
+        # unique bus name (":1.42") -> player name
+        self._owners: dict[str, str] = {}
+        # player name -> {"status", "metadata", "volume"}
+        self._state: dict[str, dict] = {}
+        self._pending = set()
+
+    def start(self):
+        """Subscribe to the session bus. Returns False when
+        D-Bus is unavailable so callers can fall back to
+        polling playerctl."""
+        if not HAS_QTDBUS:
+            return False
+        bus = QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return False
+        self._bus = bus
+        ok = bus.connect(
+            "org.freedesktop.DBus", "/org/freedesktop/DBus",
+            "org.freedesktop.DBus", "NameOwnerChanged",
+            self._on_name_owner_changed,
+        )
+        ok = ok and bus.connect(
+            "", MPRIS_PATH, DBUS_PROPS_IFACE,
+            "PropertiesChanged", self._on_properties_changed,
+        )
+        if not ok:
+            self._bus = None
+            return False
+
+        iface = bus.interface()
+        for name in iface.registeredServiceNames().value():
+            if name.startswith(MPRIS_PREFIX):
+                owner = iface.serviceOwner(name).value()
+                self._add_player(name, owner)
+        return True
+
+    def players(self):
+        return sorted(self._state)
+
+    def metadata(self):
+        """Metadata for every player, shaped like
+        get_all_metadata()."""
+        return {
+            name: dict(st["metadata"])
+            for name, st in self._state.items()
+        }
+
+    def status(self, player_name):
+        st = self._state.get(player_name)
+        return st["status"] if st else ""
+
+    def volume(self, player_name):
+        """Player volume in 0..1, or None if unknown."""
+        st = self._state.get(player_name)
+        return st["volume"] if st else None
+
+    def _add_player(self, bus_name, owner):
+        player = bus_name[len(MPRIS_PREFIX):]
+        if owner:
+            self._owners[owner] = player
+        self._state.setdefault(player, {
+            "status": "", "metadata": {}, "volume": None,
+        })
+        self._fetch_all(bus_name, player)
+        self.players_changed.emit()
+
+    def _remove_player(self, bus_name, owner):
+        player = bus_name[len(MPRIS_PREFIX):]
+        self._owners.pop(owner, None)
+        if self._state.pop(player, None) is not None:
+            self.players_changed.emit()
+
+    def _fetch_all(self, bus_name, player):
+        """Load the full property set asynchronously so a hung
+        player can't stall the GUI thread."""
+        msg = QDBusMessage.createMethodCall(
+            bus_name, MPRIS_PATH, DBUS_PROPS_IFACE, "GetAll",
+        )
+        msg.setArguments([MPRIS_PLAYER_IFACE])
+        watcher = QDBusPendingCallWatcher(
+            self._bus.asyncCall(msg, 2000), self
+        )
+        self._pending.add(watcher)
+        watcher.finished.connect(
+            lambda w, p=player: self._on_get_all(p, w)
+        )
+
+    def _on_get_all(self, player, watcher):
+        self._pending.discard(watcher)
+        watcher.deleteLater()
+        reply = QDBusPendingReply(watcher)
+        if reply.isError() or player not in self._state:
+            return
+        self._apply(player, reply.argumentAt(0) or {})
+
+    def _apply(self, player, props):
+        st = self._state[player]
+        changed = False
+        if "PlaybackStatus" in props:
+            status = str(props["PlaybackStatus"]).lower()
+            changed |= status != st["status"]
+            st["status"] = status
+        if "Metadata" in props:
+            meta = {}
+            for key, value in (props["Metadata"] or {}).items():
+                # Strip namespace prefix like get_all_metadata
+                short = key.split(":", 1)[-1]
+                meta[short] = _mpris_text(value)
+            changed |= meta != st["metadata"]
+            st["metadata"] = meta
+        if "Volume" in props:
+            try:
+                vol = float(props["Volume"])
+            except (TypeError, ValueError):
+                vol = None
+            changed |= vol != st["volume"]
+            st["volume"] = vol
+        if changed:
+            self.player_changed.emit(player)
+
+    @pyqtSlot("QDBusMessage")
+    def _on_name_owner_changed(self, msg):
+        name, old, new = msg.arguments()
+        if not name.startswith(MPRIS_PREFIX):
+            return
+        if old:
+            self._remove_player(name, old)
+        if new:
+            self._add_player(name, new)
+
+    @pyqtSlot("QDBusMessage")
+    def _on_properties_changed(self, msg):
+        args = msg.arguments()
+        if len(args) < 2 or args[0] != MPRIS_PLAYER_IFACE:
+            return
+        player = self._owners.get(msg.service())
+        if player is None or player not in self._state:
+            return
+        self._apply(player, args[1] or {})
+        invalidated = args[2] if len(args) > 2 else []
+        if invalidated:
+            # Values weren't sent; re-read them
+            self._fetch_all(MPRIS_PREFIX + player, player)
+
+
+class SinkInput:
+    """One sound server stream. `volumes` holds per-channel
+    percentages; `volume` is the first channel, which is
+    what pactl shows first."""
+
+    __slots__ = (
+        "id", "binary", "media_name", "volumes",
+        "muted", "corked", "sink",
+    )
+
+    def __init__(self, id, binary="", media_name="", volumes=(),
+                 muted=False, corked=False, sink=None):
+        self.id = id
+        self.binary = binary
+        self.media_name = media_name
+        self.volumes = volumes
+        self.muted = muted
+        self.corked = corked
+        self.sink = sink
+
+    @property
+    def volume(self):
+        return self.volumes[0] if self.volumes else 100
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"SinkInput(#{self.id} {self.binary!r} "
+            f"{self.media_name!r} vol={list(self.volumes)} "
+            f"muted={self.muted} corked={self.corked} "
+            f"sink={self.sink})"
+        )
+
+
+_PERCENT_RE = re.compile(r"(\d+)%")
+
+
+def _si_flag(attr):
+    def parse(si, value):
+        setattr(si, attr, value.strip().lower() == "yes")
+    return parse
+
+
+def _si_volume(si, value):
+    si.volumes = [int(v) for v in _PERCENT_RE.findall(value)]
+
+
+def _si_sink(si, value):
+    value = value.strip()
+    si.sink = int(value) if value.isdigit() else value
+
+
+# "Key: value" lines directly under "Sink Input #N"
+_SINK_INPUT_FIELDS = {
+    "Sink": _si_sink,
+    "Volume": _si_volume,
+    "Mute": _si_flag("muted"),
+    "Muted": _si_flag("muted"),
+    "Corked": _si_flag("corked"),
+    "Cork": _si_flag("corked"),
+}
+# 'key = "value"' lines in the Properties block
+_SINK_INPUT_PROPS = {
+    "application.process.binary": "binary",
+    "media.name": "media_name",
+}
+
+
+def _parse_sink_input_lines(lines):
+    """Parse `pactl list sink-inputs` text line by line,
+    yielding SinkInput records as each one completes."""
+    cur = None
+    fields = _SINK_INPUT_FIELDS
+    props = _SINK_INPUT_PROPS
+    for line in lines:
+        if line.startswith("Sink Input #"):
+            if cur is not None:
+                yield cur
+            cur = SinkInput(line[12:].strip())
+            continue
+        if cur is None:
+            continue
+        if line.startswith("\t\t"):
+            key, sep, value = line.strip().partition(" = ")
+            attr = props.get(key)
+            if attr and sep:
+                setattr(cur, attr, value.strip('"'))
+            continue
+        key, sep, value = line.strip().partition(": ")
+        parse = fields.get(key)
+        if parse and sep:
+            parse(cur, value)
+    if cur is not None:
+        yield cur
+
+
+def _parse_sink_input_json(data):
+    """Build SinkInput records from `pactl -f json list
+    sink-inputs`."""
+    entries = []
+    for obj in data:
+        props = obj.get("properties") or {}
+        entries.append(SinkInput(
+            str(obj["index"]),
+            props.get("application.process.binary", ""),
+            props.get("media.name", ""),
+            [
+                int(str(ch["value_percent"]).rstrip("%"))
+                for ch in (obj.get("volume") or {}).values()
+            ],
+            bool(obj.get("mute")),
+            bool(obj.get("corked")),
+            obj.get("sink"),
+        ))
+    return entries
+
+
+# None until the first listing tells us whether pactl
+# understands -f json (PulseAudio 16+, pipewire-pulse)
+_pactl_json = None
+
+
+def _pactl_sink_inputs_json():
+    try:
+        result = subprocess.run(
+            ["pactl", "-f", "json", "list", "sink-inputs"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return None
+        data = json.loads(result.stdout)
+        if not isinstance(data, list):
+            return None
+        return _parse_sink_input_json(data)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _pactl_takes_json():
+    """Whether this pactl has -f json (PulseAudio 16+), from
+    `pactl --version`; None if that can't be run."""
+    try:
+        r = subprocess.run(
+            ["pactl", "--version"], capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    m = re.match(r"pactl (\d+)", r.stdout)
+    return bool(m) and int(m.group(1)) >= 16
+
+
+def _pactl_sink_inputs_text():
+    try:
+        proc = subprocess.Popen(
+            ["pactl", "list", "sink-inputs"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return []
+    with proc:
+        entries = list(_parse_sink_input_lines(proc.stdout))
+    if proc.returncode != 0:
+        return []
+    return entries
+
+
+def _parse_sink_inputs():
+    """List sink inputs as SinkInput records, using pactl's
+    JSON output when it has one and the text listing
+    otherwise."""
+    global _pactl_json
+    if _pactl_json is not False:
+        entries = _pactl_sink_inputs_json()
+        if entries is not None:
+            _pactl_json = True
+            return entries
+        if _pactl_json is None:
+            # Only a pactl without -f json rules it out; a
+            # server that isn't up yet or garbled output just
+            # falls back this once
+            _pactl_json = _pactl_takes_json()
+    return _pactl_sink_inputs_text()
+
+
+def get_sink_inputs_for_binary(binary, entries=None):
+    """Return list of (sink_input_id, volume%, muted) for
+    all PulseAudio sink inputs whose binary starts with the
+    given name. `entries` defaults to a fresh pactl listing."""
+    if entries is None:
+        entries = _parse_sink_inputs()
+    binary_lower = binary.lower()
+    return [
+        (si.id, si.volume, si.muted)
+        for si in entries
+        if si.binary.lower().startswith(binary_lower)
+    ]
+
+
+def get_active_media_name_for_binary(binary, entries=None):
+    """Return the media_name from the active (uncorked)
+    pactl sink input matching the given binary, or None."""
+    if entries is None:
+        entries = _parse_sink_inputs()
+    binary_lower = binary.lower()
+    for si in entries:
+        if (
+            si.binary.lower().startswith(binary_lower)
+            and not si.corked
+            and si.media_name
+        ):
+            return si.media_name
+    return None
+
+
+def _pactl_default_sink(name=True):
+    """Poll default sink name, volume% and mute via pactl.
+    `name=False` skips the name query (returned as None)."""
+    sink = {"name": None, "volume": None, "muted": False}
+    try:
+        if name:
+            r = subprocess.run(
+                ["pactl", "get-default-sink"],
+                capture_output=True, text=True,
+            )
+            sink["name"] = r.stdout.strip()
+        r = subprocess.run(
+            ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
+            capture_output=True, text=True,
+        )
+        if r.returncode == 0 and "%" in r.stdout:
+            vol_str = r.stdout.split("%")[0].split()[-1]
+            try:
+                sink["volume"] = int(vol_str)
+            except ValueError:
+                pass
+        r = subprocess.run(
+            ["pactl", "get-sink-mute", "@DEFAULT_SINK@"],
+            capture_output=True, text=True,
+        )
+        if r.returncode == 0:
+            sink["muted"] = "yes" in r.stdout.lower()
+    except Exception as e:
+        print(f"Error polling default sink: {e}")
+    return sink
+
+
+def _sink_record(index, name, description="", properties=None):
+    """Sink in the shape AudioState.sinks and SinkIndex use."""
+    return {
+        "index": index, "name": name,
+        "description": description,
+        "properties": properties or {},
+        "volume": None, "muted": False,
+    }
+
+
+def _pactl_sinks():
+    """List sinks via pactl. Only JSON output carries
+    descriptions and properties; the short listing gives
+    index and name."""
+    if _pactl_json is not False:
+        try:
+            r = subprocess.run(
+                ["pactl", "-f", "json", "list", "sinks"],
+                capture_output=True, text=True,
+            )
+            if r.returncode == 0:
+                return [
+                    _sink_record(
+                        obj["index"], obj["name"],
+                        obj.get("description", ""),
+                        obj.get("properties"),
+                    )
+                    for obj in json.loads(r.stdout)
+                ]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    try:
+        r = subprocess.run(
+            ["pactl", "list", "sinks", "short"],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return []
+    sinks = []
+    for line in r.stdout.splitlines():
+        fields = line.split("\t")
+        if len(fields) >= 2 and fields[0].isdigit():
+            sinks.append(_sink_record(int(fields[0]), fields[1]))
+    return sinks
+
+
+def run_pactl_batch(argvs):
+    """Run pactl commands concurrently, PACTL_BATCH at a
+    time, so N independent calls cost about one round trip.
+    Returns the exit codes in order."""
+    codes = []
+    for start in range(0, len(argvs), PACTL_BATCH):
+        procs = []
+        for argv in argvs[start:start + PACTL_BATCH]:
+            try:
+                procs.append(subprocess.Popen(
+                    argv, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                ))
+            except OSError:
+                procs.append(None)
+        codes += [p.wait() if p else -1 for p in procs]
+    return codes
+
+
+def _pulse_volume_pct(obj):
+    # pactl reports the first channel; match it
+    values = obj.volume.values
+    return round(values[0] * 100) if values else 0
+
+
+class PulseEventThread(QThread):
+    """Blocks in libpulse's event loop on a dedicated
+    connection and forwards subscription events to the GUI
+    thread (pulse calls aren't allowed from the callback)."""
+    event = pyqtSignal(str, str, int)  # facility, type, index
+    FACILITIES = ("sink", "sink_input", "server")
+
+    def run(self):
+        try:
+            with pulsectl.Pulse("media-touchpad-events") as pulse:
+                self._pulse = pulse
+                pulse.event_mask_set(*self.FACILITIES)
+                pulse.event_callback_set(self._forward)
+                pulse.event_listen()
+        except pulsectl.PulseError as e:
+            print(f"Pulse event loop stopped: {e}")
+
+    def _forward(self, ev):
+        # pulsectl enum values compare equal to plain strings
+        for facility in self.FACILITIES:
+            if ev.facility == facility:
+                ev_type = "remove" if ev.t == "remove" else "change"
+                self.event.emit(facility, ev_type, ev.index)
+                return
+
+    def stop(self):
+        pulse = getattr(self, "_pulse", None)
+        if pulse is not None:
+            pulse.event_listen_stop()
+        self.wait(1000)
+
+
+class AudioState(QObject):
+    """Sound server state (default sink, sinks, sink inputs)
+    that widgets read from.
+
+    With pulsectl available this holds one long-lived
+    connection and applies subscription events incrementally;
+    otherwise poll() refreshes it from pactl."""
+    changed = pyqtSignal(str)  # "sink", "sink_input" or "server"
+
+    def __init__(self):
+        super().__init__()
+        self.live = False
+        self.default_sink_name = ""
+        # index -> _sink_record(); volume/muted only when live
+        self.sinks: dict[int, dict] = {}
+        self.sink_input_map: dict[int, SinkInput] = {}
+        self._polled_sink = {
+            "name": "", "volume": None, "muted": False,
+        }
+        self._pulse = None
+        self._events = None
+
+    def start(self):
+        """Connect to the sound server. Returns False when
+        only pactl polling is possible."""
+        if not _load_pulsectl():
+            return False
+        try:
+            self._pulse = pulsectl.Pulse("media-touchpad")
+            self._load_server()
+            for sink in self._pulse.sink_list():
+                self._store_sink(sink)
+            for si in self._pulse.sink_input_list():
+                self._store_sink_input(si)
+        except pulsectl.PulseError as e:
+            print(f"Pulse connection failed, polling pactl: {e}")
+            self._pulse = None
+            return False
+        self._events = PulseEventThread()
+        self._events.event.connect(self._on_event)
+        self._events.start()
+        self.live = True
+        return True
+
+    def stop(self):
+        if self._events is not None:
+            self._events.stop()
+            self._events = None
+        if self._pulse is not None:
+            self._pulse.close()
+            self._pulse = None
+        self.live = False
+
+    def poll(self, sink_name=True):
+        """Fallback: refresh everything from pactl.
+        `sink_name=False` keeps the last default sink name
+        and sink list."""
+        with profiler.phase("pactl.default_sink"):
+            self._polled_sink = _pactl_default_sink(sink_name)
+        if sink_name:
+            self.default_sink_name = self._polled_sink["name"]
+            self._poll_sinks()
+        else:
+            self._polled_sink["name"] = self.default_sink_name
+        with profiler.phase("pactl.sink_inputs"):
+            self.sink_input_map = {
+                int(si.id): si for si in _parse_sink_inputs()
+            }
+
+    def poll_sink_name(self):
+        """Fallback: refresh only the default sink name and
+        the sink list."""
+        if self.live:
+            return
+        with profiler.phase("pactl.default_sink_name"):
+            try:
+                r = subprocess.run(
+                    ["pactl", "get-default-sink"],
+                    capture_output=True, text=True,
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"Error polling default sink name: {e}")
+                return
+        if r.returncode != 0:
+            # Keep the last known name
+            return
+        self.default_sink_name = r.stdout.strip()
+        self._polled_sink["name"] = self.default_sink_name
+        self._poll_sinks()
+
+    def _poll_sinks(self):
+        with profiler.phase("pactl.sinks"):
+            self.sinks = {s["index"]: s for s in _pactl_sinks()}
+
+    # --- Read API ---
+
+    def default_sink(self):
+        """Return {"name", "volume", "muted"} for the
+        default sink; volume is None when unknown."""
+        if not self.live:
+            return self._polled_sink
+        for sink in self.sinks.values():
+            if sink["name"] == self.default_sink_name:
+                return sink
+        return {
+            "name": self.default_sink_name,
+            "volume": None, "muted": False,
+        }
+
+    def sink_inputs(self):
+        return [
+            self.sink_input_map[i]
+            for i in sorted(self.sink_input_map)
+        ]
+
+    def sink_inputs_for_binary(self, binary):
+        return get_sink_inputs_for_binary(
+            binary, self.sink_inputs()
+        )
+
+    def active_media_name_for_binary(self, binary):
+        return get_active_media_name_for_binary(
+            binary, self.sink_inputs()
+        )
+
+    # --- Event handling ---
+
+    def _load_server(self):
+        info = self._pulse.server_info()
+        self.default_sink_name = info.default_sink_name or ""
+
+    def _store_sink(self, sink):
+        record = _sink_record(
+            sink.index, sink.name, sink.description,
+            dict(sink.proplist),
+        )
+        record["volume"] = _pulse_volume_pct(sink)
+        record["muted"] = bool(sink.mute)
+        self.sinks[sink.index] = record
+
+    def _store_sink_input(self, si):
+        props = si.proplist
+        self.sink_input_map[si.index] = SinkInput(
+            str(si.index),
+            props.get("application.process.binary", ""),
+            props.get("media.name", ""),
+            [round(v * 100) for v in si.volume.values],
+            bool(si.mute),
+            bool(si.corked),
+            si.sink,
+        )
+
+    def _on_event(self, facility, ev_type, index):
+        if self._pulse is None:
+            return
+        try:
+            if facility == "server":
+                self._load_server()
+            elif facility == "sink":
+                if ev_type == "remove":
+                    self.sinks.pop(index, None)
+                else:
+                    self._store_sink(self._pulse.sink_info(index))
+            elif facility == "sink_input":
+                if ev_type == "remove":
+                    self.sink_input_map.pop(index, None)
+                else:
+                    self._store_sink_input(
+                        self._pulse.sink_input_info(index)
+                    )
+            else:
+                return
+        except pulsectl.PulseIndexError:
+            # Object vanished before we could query it
+            if facility == "sink":
+                self.sinks.pop(index, None)
+            elif facility == "sink_input":
+                self.sink_input_map.pop(index, None)
+        except pulsectl.PulseError as e:
+            print(f"Error applying pulse event: {e}")
+            return
+        self.changed.emit(facility)
+
+
+def _player_binary(player_name):
+    return player_name.split(".")[0]
+
+
+def _is_browser_player(player_name):
+    base = _player_binary(player_name).lower()
+    return any(
+        b in base
+        for b in ("firefox", "chromium", "chrome")
+    )
+
+
+def take_snapshot(mpris, audio, use_mpris):
+    """Snapshot from the live models, or from playerctl
+    when `use_mpris` is false."""
+    sink_inputs = audio.sink_inputs()
+    if use_mpris:
+        players = mpris.players()
+        return Snapshot(
+            players, mpris.metadata(), sink_inputs,
+            {p: mpris.status(p) for p in players},
+            {p: mpris.volume(p) for p in players},
+        )
+    with profiler.phase("get_players"):
+        players = get_players()
+    with profiler.phase("get_all_metadata"):
+        metadata = get_all_metadata()
+    with profiler.phase("get_player_states"):
+        states = get_player_states()
+    return Snapshot(
+        players, metadata, sink_inputs,
+        {p: st for p, (st, _) in states.items()},
+        {p: vol for p, (_, vol) in states.items()},
+    )
+
+
+class Snapshot:
+    """Player and sink-input state for one refresh pass.
+
+    Everything is fetched once up front (or read from the
+    live D-Bus/libpulse models) and indexed so every row can
+    look itself up without re-running playerctl or pactl."""
+
+    def __init__(self, players, metadata, sink_inputs,
+                 statuses, volumes):
+        self.players = players
+        self.metadata = metadata
+        self.sink_inputs = sink_inputs
+        self.statuses = statuses
+        self.volumes = volumes
+        self._by_binary: dict[str, list[SinkInput]] = {}
+        for si in sink_inputs:
+            self._by_binary.setdefault(
+                si.binary.lower(), []
+            ).append(si)
+        self._binary_hits: dict[str, list[SinkInput]] = {}
+
+    def meta(self, player_name):
+        # Metadata keys may be short names (e.g.
+        # "firefox") while playerctl -l returns full
+        # instance names (e.g. "firefox.instance123")
+        base = player_name.split(".")[0]
+        return self.metadata.get(
+            player_name, self.metadata.get(base, {})
+        )
+
+    def status(self, player_name):
+        return self.statuses.get(player_name, "")
+
+    def volume(self, player_name):
+        return self.volumes.get(player_name)
+
+    def players_for_binary(self, binary):
+        binary_low = binary.lower()
+        return [
+            p for p in self.players
+            if p.split(".")[0].lower() == binary_low
+        ]
+
+    def _inputs_for_binary(self, binary):
+        """Sink inputs whose binary starts with `binary`, in
+        pactl order."""
+        key = binary.lower()
+        hits = self._binary_hits.get(key)
+        if hits is None:
+            hits = [
+                si for b, entries in self._by_binary.items()
+                if b.startswith(key)
+                for si in entries
+            ]
+            hits.sort(key=lambda si: int(si.id))
+            self._binary_hits[key] = hits
+        return hits
+
+    def sink_inputs_for_binary(self, binary):
+        return get_sink_inputs_for_binary(
+            binary, self._inputs_for_binary(binary)
+        )
+
+    def active_media_name_for_binary(self, binary):
+        return get_active_media_name_for_binary(
+            binary, self._inputs_for_binary(binary)
+        )
+
+
+SinkProfile = namedtuple("SinkProfile", "name match")
+
+
+class SinkIndex:
+    """Sinks by index and by name, with every field (name,
+    description, properties) flattened for matching."""
+
+    def __init__(self, sinks):
+        self.sinks = sorted(sinks, key=lambda s: s["index"])
+        self.by_index = {s["index"]: s for s in self.sinks}
+        self.by_name = {s["name"]: s for s in self.sinks}
+        self._fields = {
+            s["index"]: {
+                **s["properties"],
+                "name": s["name"],
+                "description": s["description"],
+            }
+            for s in self.sinks
+        }
+        self._found = {}
+
+    def find(self, match):
+        """First sink whose fields contain every substring in
+        `match` ({field: substring}), or None."""
+        key = tuple(sorted(match.items()))
+        if key not in self._found:
+            self._found[key] = next((
+                s for s in self.sinks
+                if all(
+                    want in str(self._fields[s["index"]].get(f, ""))
+                    for f, want in key
+                )
+            ), None)
+        return self._found[key]
+
+
+class SinkRouter:
+    """Cycles the default sink through configured profiles
+    and brings the existing streams along."""
+
+    def __init__(self, profiles):
+        self.profiles = profiles
+
+    @classmethod
+    def from_config(cls, path=SINK_CONFIG_PATH):
+        """Profiles from `path` (a JSON list of {"name",
+        "match"}), or the built-in ones."""
+        raw = DEFAULT_SINK_PROFILES
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    raw = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring {path}: {e}")
+        profiles = []
+        for entry in raw:
+            try:
+                match = entry["match"]
+                if isinstance(match, str):
+                    match = {"name": match}
+                profiles.append(SinkProfile(
+                    str(entry["name"]),
+                    {str(k): str(v) for k, v in match.items()},
+                ))
+            except (KeyError, TypeError, AttributeError):
+                print(f"Ignoring sink profile {entry!r}")
+        return cls(profiles)
+
+    def available(self, index):
+        """(profile, sink) for each profile with a sink."""
+        pairs = []
+        for profile in self.profiles:
+            sink = index.find(profile.match)
+            if sink is not None:
+                pairs.append((profile, sink))
+        return pairs
+
+    def next_profile(self, index, current_sink_name):
+        """The profile after the one `current_sink_name`
+        belongs to, wrapping around; None if there is
+        nothing else to switch to."""
+        pairs = self.available(index)
+        for i, (_, sink) in enumerate(pairs):
+            if sink["name"] == current_sink_name:
+                if len(pairs) < 2:
+                    return None
+                return pairs[(i + 1) % len(pairs)][0]
+        return pairs[0][0] if pairs else None
+
+    def route(self, profile, index, streams):
+        """Make `profile`'s sink the default and move
+        `streams` ((id, sink index) pairs) onto it in one
+        concurrent batch. Returns the sink name, or None."""
+        sink = index.find(profile.match)
+        if sink is None:
+            return None
+        name = sink["name"]
+        argvs = [["pactl", "set-default-sink", name]]
+        argvs += [
+            ["pactl", "move-sink-input", str(sid), name]
+            for sid, on_sink in streams
+            if on_sink != sink["index"]
+        ]
+        with profiler.phase("pactl.route"):
+            codes = run_pactl_batch(argvs)
+        failed = sum(1 for c in codes if c != 0)
+        if failed:
+            print(f"{failed}/{len(argvs)} pactl calls failed "
+                  f"switching to {name}")
+        return name
+
+
+class MediaActions:
+    """Control actions as playerctl/pactl jobs, shared by
+    the window and the daemon.
+
+    `host` provides snapshot(), run_command(job, key=None),
+    audio, router, saved_volumes and state (a StateStore).
+    Volumes are percentages."""
+
+    def __init__(self, host):
+        self.host = host
+
+    def perform(self, op, args):
+        """Run a protocol op such as "play-pause" with its
+        arguments ({"player": ...}). Raises ValueError for
+        unknown ops and TypeError for bad arguments."""
+        handler = self.OPS.get(op)
+        if handler is None:
+            raise ValueError(f"unknown op {op!r}")
+        for name, value in args.items():
+            if name not in self.ARG_TYPES:
+                # The handler rejects it
+                continue
+            types, what = self.ARG_TYPES[name]
+            # bool is an int, but not a volume
+            if not isinstance(value, types) or isinstance(value, bool):
+                raise TypeError(
+                    f"{op}: {name} must be {what}, "
+                    f"not {type(value).__name__}"
+                )
+        return handler(self, **args)
+
+    def _target(self, player):
+        """For browsers, the playerctl instance that is
+        actually Playing (not just any instance)."""
+        if not _is_browser_player(player):
+            return player
+        snap = self.host.snapshot()
+        for p in snap.players_for_binary(_player_binary(player)):
+            if snap.status(p) == "playing":
+                return p
+        return player
+
+    def _sink_ids(self, player):
+        return self.host.snapshot().sink_inputs_for_binary(
+            _player_binary(player)
+        )
+
+    def play_pause(self, player):
+        self.host.run_command(
+            ["playerctl", "-p", self._target(player), "play-pause"]
+        )
+
+    def next_track(self, player):
+        self.host.run_command(
+            ["playerctl", "-p", self._target(player), "next"]
+        )
+
+    def player_volume(self, player, volume):
+        volume = max(0, min(100, int(volume)))
+        run = self.host.run_command
+        if _is_browser_player(player):
+            for sid, _, _ in self._sink_ids(player):
+                run(
+                    ["pactl", "set-sink-input-volume",
+                     sid, f"{volume}%"],
+                    key=("sink-input-volume", sid),
+                )
+        else:
+            run(
+                ["playerctl", "-p", player,
+                 "volume", str(volume / 100.0)],
+                key=("player-volume", player),
+            )
+
+    def player_mute(self, player):
+        """Toggle a player's mute. Players without a mute
+        control are zeroed and restored to their saved
+        volume. Returns False when the volume is unknown."""
+        run = self.host.run_command
+        if _is_browser_player(player):
+            for sid, _, _ in self._sink_ids(player):
+                run(
+                    ["pactl", "set-sink-input-mute",
+                     sid, "toggle"]
+                )
+            return True
+        saved = self.host.saved_volumes
+        current = self.host.snapshot().volume(player)
+        if current is None:
+            return False
+        if current > 0.01:
+            saved[player] = current
+            self.host.state.set("saved_volumes", dict(saved))
+            target = 0
+        else:
+            target = saved.get(player, 1.0)
+        run(
+            ["playerctl", "-p", player, "volume", str(target)],
+            key=("player-volume", player),
+        )
+        return True
+
+    def set_volume(self, volume):
+        volume = max(0, min(100, int(volume)))
+        self.host.run_command(
+            ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{volume}%"],
+            key="default-sink-volume",
+        )
+
+    def toggle_mute(self):
+        self.host.run_command(
+            ["pactl", "set-sink-mute", "@DEFAULT_SINK@", "toggle"]
+        )
+
+    def switch_sink(self, profile=None, current=None):
+        """Route to the profile named `profile`, or to the
+        one after `current` (default: the default sink).
+        Returns the target sink name, or None."""
+        audio = self.host.audio
+        router = self.host.router
+        index = SinkIndex(audio.sinks.values())
+        if profile is None:
+            target = router.next_profile(
+                index, current or audio.default_sink_name
+            )
+        else:
+            target = next(
+                (p for p in router.profiles if p.name == profile),
+                None,
+            )
+            if target is None:
+                raise ValueError(f"unknown sink profile {profile!r}")
+        if target is None:
+            return None
+        # Live models are current; polled ones get re-read
+        # on the dispatcher thread
+        sinks = streams = None
+        if audio.live:
+            sinks = list(audio.sinks.values())
+            streams = [(si.id, si.sink) for si in audio.sink_inputs()]
+        self.host.run_command(
+            lambda: self._route_job(target, sinks, streams)
+        )
+        sink = index.find(target.match)
+        return sink["name"] if sink else None
+
+    def _route_job(self, profile, sinks, streams):
+        # Runs on the dispatcher thread; no widget access here
+        if sinks is None:
+            sinks = _pactl_sinks()
+        if streams is None:
+            streams = [(si.id, si.sink) for si in _parse_sink_inputs()]
+        if self.host.router.route(
+            profile, SinkIndex(sinks), streams
+        ) is None:
+            print(f"No sink matches profile {profile.name!r}")
+
+    OPS = {
+        "play-pause": play_pause,
+        "next": next_track,
+        "player-volume": player_volume,
+        "player-mute": player_mute,
+        "volume": set_volume,
+        "mute": toggle_mute,
+        "switch-sink": switch_sink,
+    }
+
+    # Argument types the ops take, by argument name. Requests
+    # come from any client, so perform() checks them
+    ARG_TYPES = {
+        "player": (str, "a string"),
+        "volume": ((int, float), "a number"),
+        "profile": (str, "a string"),
+        "current": (str, "a string"),
+    }
+
+
+class CommandDispatcher(QThread):
+    """Runs control commands off the GUI thread.
+
+    A job is an argv list or a callable. Jobs submitted with a
+    key coalesce: a newer job replaces a pending one for the
+    same key, so a fader drag sends only the latest value, and
+    each key is sent at most CONTROL_RATE_HZ times a second.
+    Unkeyed jobs run in submission order."""
+    command_done = pyqtSignal()
+
+    def __init__(self, rate_hz=CONTROL_RATE_HZ):
+        super().__init__()
+        self._min_interval = 1.0 / rate_hz if rate_hz else 0.0
+        self._cond = threading.Condition()
+        self._queue: OrderedDict = OrderedDict()
+        self._last_sent: dict = {}
+        self._seq = itertools.count()
+        self._stopping = False
+
+    def submit(self, job, key=None):
+        if key is None:
+            key = ("seq", next(self._seq))
+        with self._cond:
+            # Assigning an existing key keeps its queue slot
+            self._queue[key] = job
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.wait(2000)
+
+    def _next_job(self):
+        """Pop the first job whose key isn't rate limited.
+        Returns (job, None) or (None, seconds_to_wait)."""
+        now = time.monotonic()
+        soonest = None
+        for key, job in self._queue.items():
+            ready_at = self._last_sent.get(key, 0) + self._min_interval
+            if ready_at <= now:
+                del self._queue[key]
+                if key[0] != "seq":
+                    self._last_sent[key] = now
+                return job, None
+            wait = ready_at - now
+            soonest = wait if soonest is None else min(soonest, wait)
+        return None, soonest
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job, wait = self._next_job()
+                if job is None:
+                    self._cond.wait(wait)
+                    continue
+            try:
+                if callable(job):
+                    job()
+                else:
+                    subprocess.run(job, capture_output=True)
+            except Exception as e:
+                print(f"Error running command {job}: {e}")
+            self.command_done.emit()
+
+
+class RefreshScheduler(QObject):
+    """Runs named refresh tasks on adaptive intervals.
+
+    A task's callback returns whether anything changed. Each
+    unchanged run doubles the task's interval up to its slow
+    limit; a change or poke() drops it back to the fast one.
+    All tasks pause while any pause reason is held (window
+    hidden, screen blanked) and run at once on resume."""
+
+    SCREENSAVER_IFACES = (
+        ("/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver"),
+        ("/org/gnome/ScreenSaver", "org.gnome.ScreenSaver"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = {}
+        self._pause_reasons = set()
+        self._running = False
+
+    def add(self, name, callback, fast_ms, slow_ms):
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._run(name))
+        self._tasks[name] = {
+            "callback": callback, "timer": timer,
+            "fast": fast_ms, "slow": slow_ms,
+            "interval": fast_ms,
+        }
+
+    def start(self):
+        self._running = True
+        for name in self._tasks:
+            self._arm(name)
+
+    def stop(self):
+        self._running = False
+        for task in self._tasks.values():
+            task["timer"].stop()
+
+    def interval(self, name):
+        return self._tasks[name]["interval"]
+
+    def poke(self, *names):
+        """Something happened (user input, track change):
+        go back to the fast interval for `names` (or all)."""
+        for name in names or self._tasks:
+            task = self._tasks[name]
+            task["interval"] = task["fast"]
+            timer = task["timer"]
+            if timer.isActive() and timer.remainingTime() > task["fast"]:
+                self._arm(name)
+
+    def pause(self, reason):
+        if reason in self._pause_reasons:
+            return
+        self._pause_reasons.add(reason)
+        for task in self._tasks.values():
+            task["timer"].stop()
+
+    def resume(self, reason):
+        if reason not in self._pause_reasons:
+            return
+        self._pause_reasons.discard(reason)
+        if self._pause_reasons or not self._running:
+            return
+        for name, task in self._tasks.items():
+            task["interval"] = task["fast"]
+            # Catch up right away
+            task["timer"].start(0)
 
+    @property
+    def paused(self):
+        return bool(self._pause_reasons)
 
-def get_players():
-    """Return list of playerctl player names."""
-    try:
-        result = subprocess.run(
-            ["playerctl", "-l"],
-            capture_output=True, text=True,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip().splitlines()
-    except Exception:
-        pass
-    return []
+    def _arm(self, name):
+        if not self._running or self._pause_reasons:
+            return
+        task = self._tasks[name]
+        task["timer"].start(task["interval"])
 
+    def _run(self, name):
+        task = self._tasks[name]
+        try:
+            changed = task["callback"]()
+        except Exception as e:
+            # Raising out of the timer slot would abort the
+            # process; back off and try again later
+            print(f"Error in {name!r} refresh: {e!r}")
+            changed = False
+        if changed:
+            task["interval"] = task["fast"]
+        else:
+            task["interval"] = min(
+                task["interval"] * 2, task["slow"]
+            )
+        self._arm(name)
 
-def get_all_metadata():
-    """Parse `playerctl -a metadata` into a dict keyed by
-    player name. Each value is a dict of metadata fields."""
-    try:
-        result = subprocess.run(
-            ["playerctl", "-a", "metadata"],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            return {}
-    except Exception:
-        return {}
+    # --- Screen blanking ---
 
-    players: dict[str, dict[str, str]] = {}
-    for line in result.stdout.splitlines():
-        parts = line.split(None, 2)
-        if len(parts) < 2:
-            continue
-        name = parts[0]
-        key = parts[1]
-        value = parts[2] if len(parts) > 2 else ""
-        # Strip namespace prefix (e.g. mpris:, xesam:)
-        short = key.split(":", 1)[-1] if ":" in key else key
-        players.setdefault(name, {})[short] = value
-    return players
+    def watch_screensaver(self):
+        """Pause while the session screensaver is active.
+        Returns False when no session bus is available."""
+        if not HAS_QTDBUS:
+            return False
+        bus = QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return False
+        ok = False
+        for path, iface in self.SCREENSAVER_IFACES:
+            ok = bus.connect(
+                "", path, iface, "ActiveChanged",
+                self._on_screensaver_active,
+            ) or ok
+        return ok
 
+    @pyqtSlot(bool)
+    def _on_screensaver_active(self, active):
+        if active:
+            self.pause("screensaver")
+        else:
+            self.resume("screensaver")
 
-def get_player_status(player_name):
-    """Return playerctl status string for a player."""
-    try:
-        r = subprocess.run(
-            ["playerctl", "-p", player_name, "status"],
-            capture_output=True, text=True,
-        )
-        return r.stdout.strip().lower()
-    except Exception:
-        return ""
 
+def _wire_state(snap, audio):
+    """The state clients see, as JSON-ready values."""
+    sink = audio.default_sink()
+    return {
+        "players": list(snap.players),
+        "metadata": snap.metadata,
+        "statuses": snap.statuses,
+        "volumes": snap.volumes,
+        "sink_inputs": [si.as_dict() for si in snap.sink_inputs],
+        "default_sink": {
+            "name": sink["name"], "volume": sink["volume"],
+            "muted": sink["muted"],
+        },
+        "default_sink_name": audio.default_sink_name,
+        "sinks": [audio.sinks[i] for i in sorted(audio.sinks)],
+    }
 
-def fetch_art_path(url):
-    """Return a local file path for album art URL.
-    Handles file:// and http(s):// with disk caching."""
-    if not url:
-        return None
-    if url.startswith("file://"):
-        path = url[7:]
-        return path if os.path.isfile(path) else None
-
-    os.makedirs(ART_CACHE_DIR, exist_ok=True)
-    h = hashlib.md5(url.encode()).hexdigest()
-    ext = ".jpg"
-    if ".png" in url:
-        ext = ".png"
-    cached = os.path.join(ART_CACHE_DIR, h + ext)
-    if os.path.isfile(cached):
-        return cached
-    try:
-        urllib.request.urlretrieve(url, cached)
-        return cached
-    except Exception:
-        return None
 
+class MediaDaemon(QObject):
+    """Owns the player and sink models and the actions on
+    them, and serves both on a Unix socket, so any number of
+    clients share one D-Bus/libpulse subscription (or one
+    poller) instead of each running their own.
 
-class ArtFetcher(QThread):
-    """Background thread to fetch album art."""
-    finished = pyqtSignal(str, str)  # player_name, path
+    The protocol is one JSON object per line. A request is
+    {"id": ..., "op": ..., **args} and gets {"id": ...,
+    "ok": true, "result": ...} or {"id": ..., "ok": false,
+    "error": "..."}. "state" returns the current state;
+    "subscribe" returns it and then pushes
+    {"event": "state", "state": ...} whenever it changes.
+    Every other op is a MediaActions op. Nothing polls while
+    no client is subscribed."""
 
-    def __init__(self, player_name, url):
+    def __init__(self, path=DAEMON_SOCKET, live=True):
         super().__init__()
-        self.player_name = player_name
-        self.url = url
-
-    def run(self):
-        path = fetch_art_path(self.url)
-        self.finished.emit(
-            self.player_name, path or ""
+        self.path = path
+        self._live = live
+        self.scheduler = RefreshScheduler(self)
+        self.scheduler.pause("idle")
+        self.state = StateStore(STATE_DB_PATH if live else ":memory:")
+        self.saved_volumes: dict[str, float] = dict(
+            self.state.get("saved_volumes", {})
         )
+        self.router = SinkRouter.from_config()
+        self.actions = MediaActions(self)
+        self.mpris = MprisWatcher()
+        self._use_mpris = False
+        self.audio = AudioState()
+        self._use_pulse = False
+        self._snapshot = None
+        # Encoded state last pushed, to skip no-op pushes
+        self._pushed = None
+        # socket -> {"buf": unparsed bytes, "subscribed": bool}
+        self._clients = {}
+        self.server = None
 
+        self._push_timer = QTimer(self)
+        self._push_timer.setSingleShot(True)
+        self._push_timer.setInterval(DAEMON_PUSH_MS)
+        self._push_timer.timeout.connect(self._push)
+        self.dispatcher = CommandDispatcher()
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SETTLE_MS)
+        self._settle_timer.timeout.connect(self._after_commands)
+        self.dispatcher.command_done.connect(self._settle_timer.start)
 
-def _parse_sink_inputs():
-    """Parse pactl sink inputs into a list of dicts with
-    id, binary, media_name, volume, muted, corked."""
-    try:
-        result = subprocess.run(
-            ["pactl", "list", "sink-inputs"],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            return []
-    except Exception:
-        return []
+    def start(self):
+        """Listen on `path` and connect the backends. Returns
+        False if another daemon already answers there."""
+        from PyQt5.QtNetwork import QLocalServer, QLocalSocket
 
-    entries = []
-    cur = None
-    for line in result.stdout.splitlines():
-        m = re.match(r"Sink Input #(\d+)", line)
-        if m:
-            if cur:
-                entries.append(cur)
-            cur = {
-                "id": m.group(1), "binary": "",
-                "media_name": "", "volume": 100,
-                "muted": False, "corked": False,
-            }
-            continue
-        if cur is None:
-            continue
-        stripped = line.strip()
-        if stripped.startswith("Volume:"):
-            vm = re.search(r"(\d+)%", stripped)
-            if vm:
-                cur["volume"] = int(vm.group(1))
-        elif stripped.startswith(("Muted:", "Mute:")):
-            cur["muted"] = "yes" in stripped.lower()
-        elif stripped.startswith(("Corked:", "Cork:")):
-            cur["corked"] = "yes" in stripped.lower()
-        elif stripped.startswith(
-            "application.process.binary"
-        ):
-            cur["binary"] = (
-                stripped.split("=", 1)[-1]
-                .strip().strip('"')
+        probe = QLocalSocket()
+        probe.connectToServer(self.path)
+        if probe.waitForConnected(200):
+            probe.abort()
+            return False
+        # Left behind by a daemon that didn't exit cleanly
+        QLocalServer.removeServer(self.path)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.server.listen(self.path):
+            print(f"Can't listen on {self.path}: "
+                  f"{self.server.errorString()}")
+            return False
+        self.server.newConnection.connect(self._on_new_connection)
+        self.dispatcher.start()
+
+        if self._live:
+            self._use_mpris = self.mpris.start()
+            if self._use_mpris:
+                self.mpris.players_changed.connect(self._schedule_push)
+                self.mpris.player_changed.connect(self._schedule_push)
+            self._use_pulse = self.audio.start()
+            if self._use_pulse:
+                self.audio.changed.connect(self._schedule_push)
+        if not self._use_pulse:
+            self.audio.poll()
+        # Polling fallback for whatever isn't event-driven
+        if not (self._use_mpris and self._use_pulse):
+            self.scheduler.add(
+                "state", self._poll, POLL_FAST_MS, POLL_SLOW_MS,
             )
-        elif stripped.startswith("media.name"):
-            cur["media_name"] = (
-                stripped.split("=", 1)[-1]
-                .strip().strip('"')
+        if not self._use_pulse:
+            self.scheduler.add(
+                "sink", self._poll_sink_name,
+                SINK_POLL_FAST_MS, SINK_POLL_SLOW_MS,
             )
-    if cur:
-        entries.append(cur)
-    return entries
+        self.scheduler.start()
+        return True
 
+    def shutdown(self):
+        """Stop serving and release the backends; safe to
+        call twice."""
+        self.scheduler.stop()
+        if self.server is not None:
+            # Also unlinks the socket
+            self.server.close()
+            self.server = None
+        for sock in list(self._clients):
+            sock.abort()
+        self.state.close()
+        self.dispatcher.stop()
+        self.audio.stop()
 
-def get_sink_inputs_for_binary(binary):
-    """Return list of (sink_input_id, volume%, muted) for
-    all PulseAudio sink inputs whose binary starts with the
-    given name."""
-    binary_lower = binary.lower()
-    return [
-        (si["id"], si["volume"], si["muted"])
-        for si in _parse_sink_inputs()
-        if si["binary"].lower().startswith(binary_lower)
-    ]
+    # --- Model ---
 
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = take_snapshot(
+                self.mpris, self.audio, self._use_mpris
+            )
+        return self._snapshot
 
-def get_active_media_name_for_binary(binary):
-    """Return the media_name from the active (uncorked)
-    pactl sink input matching the given binary, or None."""
-    binary_lower = binary.lower()
-    for si in _parse_sink_inputs():
-        if (
-            si["binary"].lower().startswith(binary_lower)
-            and not si["corked"]
-            and si["media_name"]
+    def invalidate_snapshot(self):
+        self._snapshot = None
+
+    def _refresh_models(self):
+        self.invalidate_snapshot()
+        if not self._use_pulse:
+            self.audio.poll()
+
+    def _poll(self):
+        """Scheduler task; returns whether anything changed."""
+        self.invalidate_snapshot()
+        if not self._use_pulse:
+            self.audio.poll(sink_name=False)
+        return self._push()
+
+    def _poll_sink_name(self):
+        self.audio.poll_sink_name()
+        return self._push()
+
+    def run_command(self, job, key=None):
+        self.invalidate_snapshot()
+        self.scheduler.poke()
+        self.dispatcher.submit(job, key)
+
+    def _after_commands(self):
+        self._refresh_models()
+        self._push()
+
+    # --- Subscribers ---
+
+    def _schedule_push(self, *_):
+        self.invalidate_snapshot()
+        if not self._push_timer.isActive():
+            self._push_timer.start()
+
+    def _push(self):
+        """Send the state to subscribers if it changed since
+        the last push. Returns whether it did."""
+        state = _wire_state(self.snapshot(), self.audio)
+        encoded = json.dumps(state, sort_keys=True)
+        if encoded == self._pushed:
+            return False
+        self._pushed = encoded
+        for sock, client in list(self._clients.items()):
+            if client["subscribed"]:
+                self._send(sock, {"event": "state", "state": state})
+        return True
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._clients[sock] = {"buf": b"", "subscribed": False}
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _drop(self, sock):
+        if self._clients.pop(sock, None) is None:
+            return
+        sock.deleteLater()
+        if not any(c["subscribed"] for c in self._clients.values()):
+            self.scheduler.pause("idle")
+
+    def _send(self, sock, message):
+        if sock.bytesToWrite() > DAEMON_MAX_BACKLOG:
+            # Not reading its pushes; it can reconnect
+            sock.abort()
+            self._drop(sock)
+            return
+        sock.write((json.dumps(message) + "\n").encode())
+
+    def _on_ready_read(self, sock):
+        client = self._clients.get(sock)
+        if client is None:
+            return
+        client["buf"] += bytes(sock.readAll())
+        *lines, client["buf"] = client["buf"].split(b"\n")
+        for line in lines:
+            if line.strip():
+                self._send(sock, self._handle(sock, line))
+        if len(client["buf"]) > DAEMON_MAX_LINE:
+            sock.abort()
+            self._drop(sock)
+
+    def _handle(self, sock, line):
+        try:
+            request = json.loads(line)
+            rid = request.pop("id", None)
+            op = request.pop("op")
+        except (ValueError, KeyError, AttributeError, TypeError):
+            return {"id": None, "ok": False, "error": "malformed request"}
+        if self.scheduler.paused:
+            # Nothing has been polling; re-read first
+            self._refresh_models()
+        try:
+            if op == "state":
+                result = _wire_state(self.snapshot(), self.audio)
+            elif op == "subscribe":
+                self._clients[sock]["subscribed"] = True
+                self.scheduler.resume("idle")
+                result = _wire_state(self.snapshot(), self.audio)
+            else:
+                result = self.actions.perform(op, request)
+        except (TypeError, ValueError) as e:
+            return {"id": rid, "ok": False, "error": str(e)}
+        except Exception as e:
+            # Raising out of the readyRead slot would abort
+            # the whole daemon
+            print(f"Request {op!r} failed: {e!r}")
+            return {"id": rid, "ok": False, "error": f"internal error: {e}"}
+        return {"id": rid, "ok": True, "result": result}
+
+
+class RemoteActions:
+    """MediaActions counterpart that forwards each action
+    to the daemon."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def play_pause(self, player):
+        self.client.request("play-pause", player=player)
+
+    def next_track(self, player):
+        self.client.request("next", player=player)
+
+    def player_volume(self, player, volume):
+        self.client.request("player-volume", player=player, volume=volume)
+
+    def player_mute(self, player):
+        self.client.request("player-mute", player=player)
+        return True
+
+    def set_volume(self, volume):
+        self.client.request("volume", volume=volume)
+
+    def toggle_mute(self):
+        self.client.request("mute")
+
+    def switch_sink(self, profile=None, current=None):
+        self.client.request("switch-sink", profile=profile, current=current)
+
+
+class DaemonClient(QObject):
+    """Subscribes to a MediaDaemon and mirrors its state
+    behind the read API of both MprisWatcher and AudioState,
+    so the window runs its event-driven path unchanged while
+    the daemon does all the D-Bus, libpulse and polling
+    work. Reconnects if the daemon restarts.
+
+    Connecting never blocks: synced is emitted once the first
+    state has arrived, failed when an attempt gives up."""
+    players_changed = pyqtSignal()
+    player_changed = pyqtSignal(str)
+    changed = pyqtSignal(str)
+    synced = pyqtSignal()
+    failed = pyqtSignal()
+
+    RECONNECT_MS = 2000
+
+    def __init__(self, path=DAEMON_SOCKET):
+        super().__init__()
+        from PyQt5.QtNetwork import QLocalSocket
+
+        self.path = path
+        self.live = True
+        self.actions = RemoteActions(self)
+        self.default_sink_name = ""
+        self.sinks: dict[int, dict] = {}
+        self._state = {
+            "players": [], "metadata": {}, "statuses": {},
+            "volumes": {}, "sink_inputs": [],
+            "default_sink": {"name": "", "volume": None, "muted": False},
+            "default_sink_name": "", "sinks": [],
+        }
+        self._sink_inputs: list[SinkInput] = []
+        self._synced = False
+        self._buf = b""
+        self._ids = itertools.count(1)
+        self._socket = QLocalSocket(self)
+        self._socket.connected.connect(self._on_connected)
+        self._socket.readyRead.connect(self._on_ready_read)
+        self._socket.errorOccurred.connect(self._on_error)
+        self._socket.disconnected.connect(self._on_disconnected)
+        # Running while an attempt waits for the first state
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.timeout.connect(self._give_up)
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setInterval(self.RECONNECT_MS)
+        self._reconnect_timer.timeout.connect(self._reconnect)
+
+    def connect_to_daemon(self, sync_ms=2000):
+        """Start connecting and subscribing. Returns False
+        right away if there is no daemon socket; otherwise
+        emits synced, or failed if the first state takes
+        longer than sync_ms (an idle daemon re-reads
+        everything before replying)."""
+        if not os.path.exists(self.path):
+            return False
+        self._buf = b""
+        self._sync_timer.start(sync_ms)
+        self._socket.connectToServer(self.path)
+        return True
+
+    def request(self, op, **args):
+        if self._socket.state() != self._socket.ConnectedState:
+            print(f"Daemon unavailable, dropped {op!r}")
+            return
+        message = {"id": next(self._ids), "op": op}
+        message.update((k, v) for k, v in args.items() if v is not None)
+        self._socket.write((json.dumps(message) + "\n").encode())
+
+    def stop(self):
+        self._reconnect_timer.stop()
+        self._sync_timer.stop()
+        self._socket.disconnected.disconnect(self._on_disconnected)
+        self._socket.errorOccurred.disconnect(self._on_error)
+        self._socket.abort()
+
+    # --- MprisWatcher read API ---
+
+    def players(self):
+        return list(self._state["players"])
+
+    def metadata(self):
+        return self._state["metadata"]
+
+    def status(self, player_name):
+        return self._state["statuses"].get(player_name, "")
+
+    def volume(self, player_name):
+        return self._state["volumes"].get(player_name)
+
+    # --- AudioState read API ---
+
+    def default_sink(self):
+        return self._state["default_sink"]
+
+    def sink_inputs(self):
+        return list(self._sink_inputs)
+
+    # --- Socket ---
+
+    def _on_connected(self):
+        self.request("subscribe")
+
+    def _on_ready_read(self):
+        self._buf += bytes(self._socket.readAll())
+        *lines, self._buf = self._buf.split(b"\n")
+        for line in lines:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if message.get("event") == "state":
+                self._apply(message["state"])
+            elif not message.get("ok"):
+                print(f"Daemon error: {message.get('error')}")
+            elif not self._synced and isinstance(message.get("result"), dict):
+                # Reply to subscribe
+                self._apply(message["result"])
+
+    def _on_error(self, error):
+        if self._sync_timer.isActive():
+            # Refused, or gone before the first state
+            self._give_up()
+
+    def _on_disconnected(self):
+        if not self._synced:
+            # A failed (re)connect attempt
+            return
+        print(f"Lost connection to daemon at {self.path}")
+        self._synced = False
+        self._buf = b""
+        self._reconnect_timer.start()
+
+    def _give_up(self):
+        self._sync_timer.stop()
+        self._socket.abort()
+        self.failed.emit()
+
+    def _reconnect(self):
+        # The timer keeps running until an attempt syncs
+        if self._socket.state() == self._socket.UnconnectedState:
+            self.connect_to_daemon()
+
+    def _apply(self, state):
+        old, self._state = self._state, state
+        first = not self._synced
+        self._synced = True
+        self._sink_inputs = [SinkInput(**d) for d in state["sink_inputs"]]
+        self.sinks = {s["index"]: s for s in state["sinks"]}
+        self.default_sink_name = state["default_sink_name"]
+
+        def player_view(s, p):
+            meta = s["metadata"]
+            return (
+                meta.get(p, meta.get(_player_binary(p))),
+                s["statuses"].get(p), s["volumes"].get(p),
+            )
+
+        if state["players"] != old["players"]:
+            self.players_changed.emit()
+        else:
+            for p in state["players"]:
+                if player_view(state, p) != player_view(old, p):
+                    self.player_changed.emit(p)
+        if any(
+            state[k] != old[k]
+            for k in ("sink_inputs", "default_sink",
+                      "default_sink_name", "sinks")
         ):
-            return si["media_name"]
-    return None
+            self.changed.emit("server")
+        if first:
+            self._sync_timer.stop()
+            self._reconnect_timer.stop()
+            self.synced.emit()
 
 
 class FaderSlider(QSlider):
@@ -238,10 +2634,29 @@ class FaderSlider(QSlider):
         super().mousePressEvent(event)
 
 
+# What a PlayerRow currently shows; diffed on every refresh
+RowView = namedtuple(
+    "RowView", "title artist album playing muted volume"
+)
+
+
+def _set_style_flag(widget, name, value):
+    """Flip a dynamic property used by stylesheet selectors
+    and re-polish just that widget."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
 class PlayerRow(QFrame):
     """A row for a single playerctl player with album art."""
 
-    IDLE_FRAME = (
+    # One stylesheet per row; state changes flip dynamic
+    # properties and re-polish instead of swapping strings.
+    ROW_STYLE = (
         "PlayerRow {"
         "  background: transparent;"
         "  border-left: 6px solid transparent;"
@@ -249,17 +2664,10 @@ class PlayerRow(QFrame):
         "  border-bottom: 1px solid #3b4252;"
         "  padding-left: 20px;"
         "}"
-    )
-    PLAYING_FRAME = (
-        "PlayerRow {"
+        "PlayerRow[playing=\"true\"] {"
         "  background: rgba(163, 190, 140, 15);"
         "  border-left: 6px solid #a3be8c;"
-        "  margin-left: 10px; padding-top: 6px; padding-bottom: 6px;"
-        "  border-bottom: 1px solid #3b4252;"
-        "  padding-left: 20px;"
         "}"
-    )
-    ROW_BTN = (
         "QPushButton {"
         "  min-width: 0; min-height: 0; padding: 4px;"
         "  font-size: 15pt; border-radius: 6px;"
@@ -268,25 +2676,14 @@ class PlayerRow(QFrame):
         "QPushButton:hover {"
         "  background-color: #434c5e;"
         "}"
-    )
-    ROW_BTN_PLAYING = (
-        "QPushButton {"
-        "  min-width: 0; min-height: 0; padding: 4px;"
-        "  font-size: 15pt; border-radius: 6px;"
-        "  background-color: #3b4252; color: #eceff4;"
+        "QPushButton#pauseBtn[playing=\"true\"] {"
         "  border: 2px solid #a3be8c;"
         "}"
-        "QPushButton:hover {"
-        "  background-color: #434c5e;"
-        "}"
-    )
-    ROW_BTN_MUTED = (
-        "QPushButton {"
-        "  min-width: 0; min-height: 0; padding: 4px;"
-        "  font-size: 10pt; border-radius: 6px;"
-        "  background-color: #bf616a; color: #eceff4;"
+        "QPushButton#muteBtn[muted=\"true\"] {"
+        "  font-size: 10pt;"
+        "  background-color: #bf616a;"
         "}"
-        "QPushButton:hover {"
+        "QPushButton#muteBtn[muted=\"true\"]:hover {"
         "  background-color: #d08770;"
         "}"
     )
@@ -317,10 +2714,10 @@ class PlayerRow(QFrame):
         self.player_name = player_name
         self.controller = parent_controller
         self._updating_slider = False
-        self._is_playing = False
+        # Last rendered RowView; None until the first refresh
+        self._view = None
         self._current_art_url = ""
-        self._art_fetcher = None
-        self.setStyleSheet(self.IDLE_FRAME)
+        self.setStyleSheet(self.ROW_STYLE)
 
         # Main horizontal layout: [art] [info+slider] [btns]
         hbox = QHBoxLayout(self)
@@ -395,8 +2792,8 @@ class PlayerRow(QFrame):
         btn_font = QFont("Sans", 15)
 
         self.pause_btn = QPushButton("⏸")
+        self.pause_btn.setObjectName("pauseBtn")
         self.pause_btn.setFont(btn_font)
-        self.pause_btn.setStyleSheet(self.ROW_BTN)
         self.pause_btn.setSizePolicy(
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
@@ -406,15 +2803,14 @@ class PlayerRow(QFrame):
 
         self.next_btn = QPushButton("⏭")
         self.next_btn.setFont(btn_font)
-        self.next_btn.setStyleSheet(self.ROW_BTN)
         self.next_btn.setSizePolicy(
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
         self.next_btn.clicked.connect(self.next_track)
 
         self.mute_btn = QPushButton("mute")
+        self.mute_btn.setObjectName("muteBtn")
         self.mute_btn.setFont(QFont("Sans", 10))
-        self.mute_btn.setStyleSheet(self.ROW_BTN)
         self.mute_btn.setSizePolicy(
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
@@ -431,149 +2827,116 @@ class PlayerRow(QFrame):
 
         hbox.addLayout(btn_box, stretch=2)
 
-        self.setMinimumHeight(ART_SIZE + 20)
+        self.setFixedHeight(PLAYER_ROW_HEIGHT)
+
+    def bind(self, player_name):
+        """Recycle this row for another player (or None).
+        Returns the previous player's (view, art URL)."""
+        previous = (self._view, self._current_art_url)
+        if self._current_art_url:
+            self.controller.art_fetcher.release(
+                self._current_art_url, self
+            )
+        self.player_name = player_name
+        self._view = None
+        self._current_art_url = ""
+        self.art_label.setPixmap(QPixmap())
+        return previous
 
     @property
     def _binary(self):
-        return self.player_name.split(".")[0]
+        return _player_binary(self.player_name)
 
     @property
     def _is_browser(self):
-        base = self._binary.lower()
-        return any(
-            b in base
-            for b in ("firefox", "chromium", "chrome")
-        )
+        return _is_browser_player(self.player_name)
 
     def _pa_sink_ids(self):
-        return get_sink_inputs_for_binary(self._binary)
+        return self.controller.snapshot().sink_inputs_for_binary(
+            self._binary
+        )
 
     def on_slider_changed(self, value):
         if self._updating_slider:
             return
-        if self._is_browser:
-            for sid, _, _ in self._pa_sink_ids():
-                subprocess.run(
-                    ["pactl", "set-sink-input-volume",
-                     sid, f"{value}%"]
-                )
-        else:
-            vol = value / 100.0
-            subprocess.run(
-                ["playerctl", "-p", self.player_name,
-                 "volume", str(vol)]
-            )
-
-    def _active_browser_instance(self):
-        """For browsers, find the playerctl instance that is
-        actually Playing (not just any instance)."""
-        binary_low = self._binary.lower()
-        for p in get_players():
-            if p.split(".")[0].lower() == binary_low:
-                if get_player_status(p) == "playing":
-                    return p
-        return self.player_name
-
-    def _schedule_refresh(self):
-        """Trigger a refresh after a short delay to let
-        the player state settle."""
-        QTimer.singleShot(
-            150, self.controller.refresh_player_rows
+        profiler.action(
+            "volume", self.player_name,
+            lambda v, want=value: v == want,
         )
+        self.controller.actions.player_volume(self.player_name, value)
 
     def toggle_play_pause(self):
-        if self._is_browser:
-            target = self._active_browser_instance()
-        else:
-            target = self.player_name
-        subprocess.run(
-            ["playerctl", "-p", target, "play-pause"]
-        )
-        self._schedule_refresh()
+        if self._view is not None:
+            profiler.action(
+                "play-pause", self.player_name,
+                lambda v, want=not self._view.playing: v == want,
+            )
+        self.controller.actions.play_pause(self.player_name)
+        # Optimistic; the next refresh reconciles it
+        if self._view is not None:
+            self._render(self._view._replace(
+                playing=not self._view.playing
+            ))
 
     def next_track(self):
-        if self._is_browser:
-            target = self._active_browser_instance()
-        else:
-            target = self.player_name
-        subprocess.run(
-            ["playerctl", "-p", target, "next"]
-        )
-        self._schedule_refresh()
+        if self._view is not None:
+            profiler.action(
+                "next", self.player_name,
+                lambda v, old=self._view.title: v != old,
+            )
+        self.controller.actions.next_track(self.player_name)
 
     def toggle_player_mute(self):
-        if self._is_browser:
-            for sid, _, _ in self._pa_sink_ids():
-                subprocess.run(
-                    ["pactl", "set-sink-input-mute",
-                     sid, "toggle"]
-                )
-        else:
-            saved = self.controller.saved_volumes
-            try:
-                result = subprocess.run(
-                    ["playerctl", "-p", self.player_name,
-                     "volume"],
-                    capture_output=True, text=True,
-                )
-                current = float(result.stdout.strip())
-            except (ValueError, Exception):
-                return
-            if current > 0.01:
-                saved[self.player_name] = current
-                subprocess.run(
-                    ["playerctl", "-p", self.player_name,
-                     "volume", "0"]
-                )
-            else:
-                restore = saved.get(
-                    self.player_name, 1.0
-                )
-                subprocess.run(
-                    ["playerctl", "-p", self.player_name,
-                     "volume", str(restore)]
-                )
-        self._schedule_refresh()
+        if self._view is not None:
+            profiler.action(
+                "mute", self.player_name,
+                lambda v, want=not self._view.muted: v == want,
+            )
+        if not self.controller.actions.player_mute(self.player_name):
+            return
+        if self._view is not None:
+            self._render(self._view._replace(
+                muted=not self._view.muted
+            ))
 
     def update_art(self, art_url):
         """Kick off album art loading if URL changed."""
         if art_url == self._current_art_url:
             return
+        if self._current_art_url:
+            self.controller.art_fetcher.release(
+                self._current_art_url, self
+            )
         self._current_art_url = art_url
         if not art_url:
             self.art_label.setPixmap(QPixmap())
             return
+        cache = self.controller.art_cache
+        pm = cache.get_pixmap(art_url)
+        if pm is not None:
+            self.art_label.setPixmap(pm)
+            return
         # file:// URLs can be loaded directly
         if art_url.startswith("file://"):
-            path = art_url[7:]
-            self._set_art_pixmap(path)
+            pm = QPixmap(art_url[7:])
+            if not pm.isNull():
+                self._set_art_pixmap(art_url, _scale_art(pm))
             return
-        # HTTP: fetch in background thread
-        self._art_fetcher = ArtFetcher(
-            self.player_name, art_url
-        )
-        self._art_fetcher.finished.connect(
-            self._on_art_fetched
-        )
-        self._art_fetcher.start()
+        # HTTP: fetch on the shared pool
+        self.controller.art_fetcher.request(art_url, self)
 
-    def _on_art_fetched(self, player_name, path):
-        if player_name == self.player_name and path:
-            self._set_art_pixmap(path)
+    def show_fetched_art(self, url, pm):
+        if url == self._current_art_url:
+            self.art_label.setPixmap(pm)
 
-    def _set_art_pixmap(self, path):
-        pm = QPixmap(path)
-        if not pm.isNull():
-            self.art_label.setPixmap(
-                pm.scaled(
-                    ART_SIZE, ART_SIZE,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
-                )
-            )
+    def _set_art_pixmap(self, url, pm):
+        self.controller.art_cache.put_pixmap(url, pm)
+        self.art_label.setPixmap(pm)
 
-    def refresh(self, meta):
-        """Update from metadata dict and playerctl status."""
+    def refresh(self, meta, status, volume=None):
+        """Update from metadata dict and playerctl status.
+        `volume` (0..1) comes from the snapshot; None means
+        the player doesn't report one."""
         title = meta.get("title", "")
         artist = meta.get("artist", "")
         album = meta.get("album", "")
@@ -583,83 +2946,181 @@ class PlayerRow(QFrame):
         # input since playerctl metadata is unreliable
         pa_title = None
         if self._is_browser:
-            pa_title = get_active_media_name_for_binary(
+            snap = self.controller.snapshot()
+            pa_title = snap.active_media_name_for_binary(
                 self._binary
             )
             if pa_title:
                 title = pa_title
 
-        self.title_label.setText(
-            title or self.player_name
+        pct, muted = self._volume_state(volume)
+        if pct is None and self._view is not None:
+            # Unknown this tick; keep what's on screen
+            pct, muted = self._view.volume, self._view.muted
+        view = RowView(
+            title=title or self.player_name,
+            artist=artist,
+            album=album,
+            playing=status == "playing",
+            muted=muted,
+            volume=pct,
         )
-        self.artist_label.setText(artist)
-        self.album_label.setText(album)
-        self.album_label.setVisible(bool(album))
-
+        if profiler.enabled:
+            name = self.player_name
+            profiler.observe("play-pause", name, view.playing)
+            profiler.observe("next", name, view.title)
+            profiler.observe("mute", name, view.muted)
+            profiler.observe("volume", name, view.volume)
+        self._render(view)
         self.update_art(art_url)
 
-        status = get_player_status(self.player_name)
-        playing = status == "playing"
-        self.pause_btn.setText(
-            "⏸" if playing else "▶"
-        )
+    def _render(self, view):
+        """Apply only the parts of `view` that differ from
+        what's already on screen."""
+        old = self._view
+        if view == old:
+            return
+        if self.vol_slider.isSliderDown():
+            # Don't fight the user's drag; pick it up later
+            view = view._replace(
+                volume=old.volume if old else None
+            )
 
-        if playing != self._is_playing:
-            self._is_playing = playing
-            self.setStyleSheet(
-                self.PLAYING_FRAME if playing
-                else self.IDLE_FRAME
+        if old is None or view.title != old.title:
+            self.title_label.setText(view.title)
+        if old is None or view.artist != old.artist:
+            self.artist_label.setText(view.artist)
+        if old is None or view.album != old.album:
+            self.album_label.setText(view.album)
+            if old is None or bool(view.album) != bool(old.album):
+                self.album_label.setVisible(bool(view.album))
+        if old is None or view.playing != old.playing:
+            self.pause_btn.setText(
+                "⏸" if view.playing else "▶"
             )
-            self.pause_btn.setStyleSheet(
-                self.ROW_BTN_PLAYING if playing
-                else self.ROW_BTN
+            _set_style_flag(self, "playing", view.playing)
+            _set_style_flag(
+                self.pause_btn, "playing", view.playing
             )
+        if old is None or view.muted != old.muted:
+            self.mute_btn.setText(
+                "unmute" if view.muted else "mute"
+            )
+            _set_style_flag(self.mute_btn, "muted", view.muted)
+        known = view.volume is not None
+        if old is None or known != (old.volume is not None):
+            # No volume to show or set
+            self.vol_slider.setEnabled(known)
+        if known and (
+            old is None or view.volume != old.volume
+        ):
+            self._updating_slider = True
+            self.vol_slider.setValue(view.volume)
+            self._updating_slider = False
+        self._view = view
 
-        self._refresh_volume()
-
-    def _refresh_volume(self):
-        pct = None
-        muted = False
-
+    def _volume_state(self, volume=None):
+        """Return (volume%, muted); volume% is None when it
+        can't be determined. Never runs playerctl: this is
+        on the render path, and the snapshot already holds
+        every volume the bulk query found."""
         if self._is_browser:
             sinks = self._pa_sink_ids()
             if sinks:
-                pct = max(v for _, v, _ in sinks)
-                muted = all(m for _, _, m in sinks)
-        else:
-            try:
-                result = subprocess.run(
-                    ["playerctl", "-p", self.player_name,
-                     "volume"],
-                    capture_output=True, text=True,
+                return (
+                    max(v for _, v, _ in sinks),
+                    all(m for _, _, m in sinks),
                 )
-                vol = float(result.stdout.strip())
-                pct = int(vol * 100)
-                muted = vol < 0.01
-            except (ValueError, Exception):
-                pass
+            return None, False
+        if volume is None:
+            return None, False
+        return int(volume * 100), volume < 0.01
 
-        if pct is not None:
-            self.mute_btn.setText(
-                "unmute" if muted else "mute"
+
+class ProfileOverlay(QLabel):
+    """Rolling --profile stats drawn over the window."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setFont(QFont("Monospace", 8))
+        self.setStyleSheet(
+            "background: rgba(46, 52, 64, 225);"
+            "color: #a3be8c; padding: 6px;"
+            "border-radius: 4px;"
+        )
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.move(10, 10)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.update_stats)
+        self._timer.start(1000)
+
+    def update_stats(self):
+        st = profiler.summary()
+        lines = [
+            f"ticks {st['ticks']}  "
+            f"p50 {st['tick_ms']['p50']:.1f}ms  "
+            f"p95 {st['tick_ms']['p95']:.1f}ms  "
+            f"forks/tick {st['forks_per_tick']:.1f}",
+            f"{'phase':22s} {'p50':>6s} {'p95':>6s}",
+        ]
+        phases = sorted(
+            st["phases"].items(), key=lambda kv: -kv[1]["p95"]
+        )
+        for name, v in phases:
+            lines.append(
+                f"{name:22s} {v['p50']:6.1f} {v['p95']:6.1f}"
             )
-            self.mute_btn.setStyleSheet(
-                self.ROW_BTN_MUTED if muted
-                else self.ROW_BTN
+        for kind, v in sorted(st["latency_ms"].items()):
+            lines.append(
+                f"{'press->' + kind:22s} "
+                f"{v['p50']:6.0f} {v['p95']:6.0f}"
             )
-            self._updating_slider = True
-            self.vol_slider.setValue(pct)
-            self._updating_slider = False
+        peak = max((c for _, c in st["histogram"]), default=0) or 1
+        for label, count in st["histogram"]:
+            bar = "█" * round(16 * count / peak)
+            lines.append(f"{label:>7s}ms {bar} {count}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
 
 
 class MediaController(QMainWindow):
-    def __init__(self):
+    def __init__(self, live=True, daemon=DAEMON_SOCKET):
+        """`live=False` skips D-Bus, libpulse and the on-disk
+        state store and polls playerctl/pactl only (used by
+        the benchmark). When a daemon answers on `daemon`
+        the window becomes its client instead of watching
+        players and sinks itself; None always runs
+        standalone."""
         super().__init__()
+        # Created first: window events reach it during setup
+        self.scheduler = RefreshScheduler(self)
         self.setWindowTitle("Media Controller")
         self.resize(450, 500)
 
-        self.saved_volumes: dict[str, float] = {}
+        self.state = StateStore(STATE_DB_PATH if live else ":memory:")
+        self.saved_volumes: dict[str, float] = dict(
+            self.state.get("saved_volumes", {})
+        )
+        # The player list is virtualized: `players` is the
+        # model, `player_rows` maps the players in view to the
+        # pooled rows showing them, and `_row_cache` keeps the
+        # last view of players scrolled out of sight
+        self.players: list[str] = []
         self.player_rows: dict[str, PlayerRow] = {}
+        self._row_pool: list[PlayerRow] = []
+        self._row_cache: dict[str, tuple] = {}
+        self._last_snapshot = None
+        self._updating_volume_slider = False
+        self._snapshot = None
+        self._global_muted = False
+        self.router = SinkRouter.from_config()
+        self.actions = MediaActions(self)
+        # Sink we just switched to, until pactl confirms it
+        self._pending_sink = None
+        self.art_cache = ArtCache()
+        self.art_fetcher = ArtFetchService(self.art_cache)
+        self.art_fetcher.fetched.connect(self._on_art_fetched)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -668,7 +3129,7 @@ class MediaController(QMainWindow):
         main_layout.setSpacing(10)
 
         # --- Per-player rows in a scroll area ---
-        scroll = QScrollArea()
+        self.players_scroll = scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
         scroll.setHorizontalScrollBarPolicy(
@@ -678,12 +3139,14 @@ class MediaController(QMainWindow):
         self.players_container.setObjectName(
             "playersContainer"
         )
-        self.players_layout = QVBoxLayout(
-            self.players_container
+        # Rows are positioned by _layout_rows, not a layout;
+        # it reruns when either the content or the viewport
+        # changes size
+        self.players_container.installEventFilter(self)
+        scroll.viewport().installEventFilter(self)
+        scroll.verticalScrollBar().valueChanged.connect(
+            self._on_players_scrolled
         )
-        self.players_layout.setContentsMargins(0, 0, 0, 0)
-        self.players_layout.setSpacing(20)
-        self.players_layout.addStretch()
         scroll.setWidget(self.players_container)
         main_layout.addWidget(scroll, 5)
 
@@ -692,6 +3155,7 @@ class MediaController(QMainWindow):
         grid_layout.setSpacing(8)
 
         self.mute_button = QPushButton("mute")
+        self.mute_button.setObjectName("globalMute")
         self.mute_button.setFont(QFont("Sans", 10))
         self.mute_button.clicked.connect(self.toggle_mute)
         self.mute_button.setSizePolicy(
@@ -749,6 +3213,9 @@ class MediaController(QMainWindow):
 
         main_layout.addLayout(grid_layout, 2)
 
+        if profiler.enabled:
+            self.profile_overlay = ProfileOverlay(central_widget)
+
         self.setMinimumSize(300, 250)
 
         self.setStyleSheet("""
@@ -792,6 +3259,10 @@ class MediaController(QMainWindow):
                 border: 1px solid #3b4252;
                 border-radius: 2px;
             }
+            QSlider::sub-page:horizontal:disabled,
+            QSlider::handle:horizontal:disabled {
+                background: #4c566a;
+            }
             QScrollArea {
                 background: transparent;
                 border: none;
@@ -799,215 +3270,575 @@ class MediaController(QMainWindow):
             #playersContainer {
                 background: transparent;
             }
+            #globalMute[muted="true"] {
+                background-color: #bf616a;
+                font-size: 10pt;
+            }
+            #globalMute[muted="true"]:hover {
+                background-color: #d08770;
+            }
         """)
 
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.periodic_update)
-        self.update_timer.start(750)
+        # Live backends connect after the first paint (see
+        # _go_live); until then everything reads as polled
+        self._live = live
+        self._daemon_path = daemon
+        self.mpris = MprisWatcher()
+        self._use_mpris = False
+        self._rows_refresh_pending = False
+        self.audio = AudioState()
+        self._use_pulse = False
+        self._audio_refresh_pending = False
 
-        self.update_volume_slider()
-        self.refresh_player_rows()
-        self.update_input_button_text()
-        self.update_mute_button_state()
+        # Paint the last known state right away; live data
+        # reconciles it once the window is up
+        self._restore_state()
+
+        # Control commands run off the GUI thread
+        self.dispatcher = CommandDispatcher()
+        self._settle_timer = QTimer()
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SETTLE_MS)
+        self._settle_timer.timeout.connect(self._after_commands)
+        self.dispatcher.command_done.connect(self._on_command_done)
+        self.dispatcher.start()
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
+
+        self._awaiting_first_paint = True
+        # A DaemonClient still waiting for its first state
+        self._pending_daemon = None
+        self.is_live = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._awaiting_first_paint:
+            # Restored state is on screen; now go live
+            self._awaiting_first_paint = False
+            startup.mark("first paint")
+            QTimer.singleShot(0, self._go_live)
+
+    def _go_live(self):
+        """Connect backends and replace the restored state
+        with live data. Runs once, after the first paint.
+        A daemon is waited for without blocking; the
+        restored state stays up until it answers."""
+        if self._live and self._daemon_path:
+            client = DaemonClient(self._daemon_path)
+            client.synced.connect(self._on_daemon_synced)
+            client.failed.connect(self._on_daemon_failed)
+            # Set first: a refused connection fails right away
+            self._pending_daemon = client
+            if client.connect_to_daemon():
+                return
+            self._pending_daemon = None
+        self._start_backends()
+
+    def _on_daemon_synced(self):
+        client, self._pending_daemon = self._pending_daemon, None
+        client.synced.disconnect(self._on_daemon_synced)
+        client.failed.disconnect(self._on_daemon_failed)
+        startup.mark("daemon synced")
+        self._start_backends(client)
+
+    def _on_daemon_failed(self):
+        client, self._pending_daemon = self._pending_daemon, None
+        client.stop()
+        client.deleteLater()
+        startup.mark("no daemon")
+        self._start_backends()
+
+    def _start_backends(self, client=None):
+        """The rest of _go_live, once it is known whether
+        a daemon (client) serves the state."""
+        if self._live:
+            if client is not None:
+                # The daemon's state arrives as pushes with
+                # the same signals the local models emit
+                self.mpris = self.audio = client
+                self.actions = client.actions
+                self._use_mpris = self._use_pulse = True
+            else:
+                # Player list, metadata and status come from
+                # D-Bus signals when possible; polling is the
+                # fallback
+                with startup.span("connect D-Bus"):
+                    self._use_mpris = self.mpris.start()
+                # Same for sinks and sink inputs via libpulse
+                with startup.span("connect libpulse"):
+                    self._use_pulse = self.audio.start()
+            if self._use_mpris:
+                self.mpris.players_changed.connect(
+                    self._schedule_rows_refresh
+                )
+                self.mpris.player_changed.connect(
+                    self._on_player_changed
+                )
+            if self._use_pulse:
+                self.audio.changed.connect(
+                    self._schedule_audio_refresh
+                )
+
+        with startup.span("initial state"):
+            if not self._use_pulse:
+                self.audio.poll()
+            self.update_volume_slider()
+            self.refresh_player_rows()
+            self.update_input_button_text()
+            self.update_mute_button_state()
+
+        # Polling fallback for whatever isn't event-driven
+        self.scheduler.add(
+            "players", self._poll_players,
+            POLL_FAST_MS, POLL_SLOW_MS,
+        )
+        if not self._use_pulse:
+            self.scheduler.add(
+                "sink", self._poll_sink_name,
+                SINK_POLL_FAST_MS, SINK_POLL_SLOW_MS,
+            )
+        if not (self._use_mpris and self._use_pulse):
+            if self._live:
+                self.scheduler.watch_screensaver()
+            self.scheduler.start()
+        self.is_live = True
+        startup.report()
+
+    # --- Persisted state ---
+
+    def _restore_state(self):
+        for entry in self.state.get("players", []):
+            try:
+                name = entry["name"]
+                view = RowView(**entry["view"])
+            except (KeyError, TypeError):
+                continue
+            self.players.append(name)
+            self._row_cache[name] = (view, entry.get("art_url", ""))
+        self._layout_rows()
+
+        master = self.state.get("master", {})
+        if master.get("volume") is not None:
+            self._updating_volume_slider = True
+            self.volume_slider.setValue(master["volume"])
+            self._updating_volume_slider = False
+        self._show_global_muted(bool(master.get("muted")))
+        label = self.state.get("sink", {}).get("label")
+        if label:
+            self.switch_input_button.setText(label)
+
+    def _save_players(self):
+        entries = []
+        for name in self.players:
+            row = self.player_rows.get(name)
+            if row is not None and row._view is not None:
+                view, url = row._view, row._current_art_url
+            elif name in self._row_cache:
+                view, url = self._row_cache[name]
+            else:
+                continue
+            entries.append({
+                "name": name, "view": view._asdict(), "art_url": url,
+            })
+        self.state.set("players", entries)
+
+    def _save_master(self):
+        self.state.set("master", {
+            "volume": self.volume_slider.value(),
+            "muted": self._global_muted,
+        })
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.scheduler.resume("hidden")
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.scheduler.pause("hidden")
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.scheduler.pause("hidden")
+            elif self.isVisible():
+                self.scheduler.resume("hidden")
+
+    def closeEvent(self, event):
+        self.shutdown()
+        super().closeEvent(event)
+
+    def shutdown(self):
+        """Stop background threads; safe to call twice."""
+        self.scheduler.stop()
+        if self._pending_daemon is not None:
+            self._pending_daemon.stop()
+            self._pending_daemon = None
+        self.state.close()
+        self.dispatcher.stop()
+        self.audio.stop()
+        self.art_fetcher.shutdown()
 
     # --- Player row management ---
 
+    def snapshot(self):
+        """Return the state snapshot for the current refresh
+        pass, taking one if none is active."""
+        if self._snapshot is None:
+            self._snapshot = self._take_snapshot()
+        return self._snapshot
+
+    def invalidate_snapshot(self):
+        self._snapshot = None
+
+    def _take_snapshot(self):
+        return take_snapshot(self.mpris, self.audio, self._use_mpris)
+
+    def _schedule_rows_refresh(self):
+        """Coalesce bursts of bus signals into a single
+        refresh on the next event loop pass."""
+        if self._rows_refresh_pending:
+            return
+        self._rows_refresh_pending = True
+        QTimer.singleShot(0, self.refresh_player_rows)
+
+    def _on_player_changed(self, player_name):
+        self.scheduler.poke("players")
+        if player_name not in self.players:
+            self._schedule_rows_refresh()
+            return
+        if player_name not in self.player_rows:
+            # Out of view; it's re-read when scrolled in
+            return
+        with profiler.tick("mpris"):
+            self.invalidate_snapshot()
+            self._refresh_row(player_name, self.snapshot())
+            self.invalidate_snapshot()
+            self._save_players()
+
+    def _refresh_row(self, name, snap):
+        with profiler.phase("row.refresh"):
+            self.player_rows[name].refresh(
+                snap.meta(name), snap.status(name),
+                snap.volume(name),
+            )
+
     def refresh_player_rows(self):
-        all_meta = get_all_metadata()
-        players = get_players()
+        with profiler.tick("refresh_player_rows"):
+            self._refresh_player_rows()
 
+    def _refresh_player_rows(self):
+        self._rows_refresh_pending = False
+        self.invalidate_snapshot()
+        snap = self.snapshot()
+        self._last_snapshot = snap
         # Use playerctl players as source of truth
-        wanted = set(players)
-        existing = set(self.player_rows.keys())
+        gone = set(self.players) - set(snap.players)
+        self.players = list(snap.players)
+        # Only rows in view are refreshed
+        self._layout_rows(lambda name: self._refresh_row(name, snap))
+        for name in gone:
+            self._row_cache.pop(name, None)
+        self.invalidate_snapshot()
+        self._save_players()
+
+    # --- Virtualized player list ---
 
-        # Remove gone rows
-        for name in existing - wanted:
-            row = self.player_rows.pop(name)
-            self.players_layout.removeWidget(row)
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.Resize and obj in (
+                self.players_container,
+                self.players_scroll.viewport())):
+            self._layout_rows()
+        return super().eventFilter(obj, event)
+
+    def _on_players_scrolled(self, _value):
+        self._layout_rows()
+
+    def _visible_range(self):
+        pitch = PLAYER_ROW_HEIGHT + PLAYER_ROW_SPACING
+        top = self.players_scroll.verticalScrollBar().value()
+        bottom = top + self.players_scroll.viewport().height()
+        first = max(0, top // pitch)
+        last = min(len(self.players), bottom // pitch + 1)
+        return first, last
+
+    def _layout_rows(self, render=None):
+        """Bind pooled rows to the players in view and place
+        them. `render(name)` fills each row in view; without
+        it only newly bound rows are filled."""
+        pitch = PLAYER_ROW_HEIGHT + PLAYER_ROW_SPACING
+        self.players_container.setMinimumHeight(
+            max(0, len(self.players) * pitch - PLAYER_ROW_SPACING)
+        )
+        first, last = self._visible_range()
+        wanted = self.players[first:last]
+
+        # Rows already showing a wanted player stay put
+        kept, free = {}, []
+        for row in self._row_pool:
+            if row.player_name in wanted and row.player_name not in kept:
+                kept[row.player_name] = row
+            else:
+                free.append(row)
+        fresh = []
+        for name in wanted:
+            if name in kept:
+                continue
+            if free:
+                row = free.pop()
+                self._unbind_row(row)
+            else:
+                row = PlayerRow(None, self)
+                row.setParent(self.players_container)
+                self._row_pool.append(row)
+            row.bind(name)
+            kept[name] = row
+            fresh.append(name)
+        # Keep one spare; the pool tracks the viewport size
+        for row in free[1:]:
+            self._unbind_row(row)
+            self._row_pool.remove(row)
             row.deleteLater()
+        for row in free[:1]:
+            self._unbind_row(row)
+            row.hide()
 
-        # Add/update rows
-        for name in players:
-            if name not in self.player_rows:
-                row = PlayerRow(name, self)
-                idx = self.players_layout.count() - 1
-                self.players_layout.insertWidget(idx, row)
-                self.player_rows[name] = row
-            # Metadata keys may be short names (e.g.
-            # "firefox") while playerctl -l returns full
-            # instance names (e.g. "firefox.instance123")
-            base = name.split(".")[0]
-            meta = all_meta.get(name, all_meta.get(
-                base, {}
-            ))
-            self.player_rows[name].refresh(meta)
+        width = self.players_container.width()
+        self.player_rows = {}
+        for i, name in enumerate(wanted, first):
+            row = kept[name]
+            row.setGeometry(0, i * pitch, width, PLAYER_ROW_HEIGHT)
+            row.show()
+            self.player_rows[name] = row
+
+        if render is not None:
+            for name in wanted:
+                render(name)
+        elif fresh:
+            self._render_bound(fresh)
+
+    def _unbind_row(self, row):
+        name = row.player_name
+        if name is None:
+            return
+        view, url = row.bind(None)
+        if view is not None:
+            self._row_cache[name] = (view, url)
+
+    def _render_bound(self, names):
+        """Fill rows just scrolled into view: cached view
+        first, then live data if there's a snapshot to use."""
+        for name in names:
+            cached = self._row_cache.get(name)
+            if cached is not None:
+                self._show_cached(self.player_rows[name], *cached)
+        # D-Bus state is already in memory; polled state is
+        # whatever the last tick fetched
+        snap = (
+            self._take_snapshot() if self._use_mpris
+            else self._last_snapshot
+        )
+        if snap is None:
+            return
+        self._snapshot = snap
+        for name in names:
+            if name in snap.players:
+                self._refresh_row(name, snap)
+        self.invalidate_snapshot()
+
+    def _show_cached(self, row, view, url):
+        row._render(view)
+        if url.startswith(("http://", "https://")):
+            # Prefer the thumbnail on disk to a network fetch
+            if self.art_cache.get_pixmap(url) is None:
+                thumb = self.art_cache.cached_thumb(url)
+                pm = QPixmap(thumb) if thumb else QPixmap()
+                if not pm.isNull():
+                    self.art_cache.put_pixmap(url, pm)
+        row.update_art(url)
+
+    def _on_art_fetched(self, url, path):
+        """Decode a fetched thumbnail once and hand it to
+        every row still showing that URL."""
+        if not path:
+            return
+        # Thumbnails are stored pre-scaled
+        pm = QPixmap(path)
+        if pm.isNull():
+            return
+        self.art_cache.put_pixmap(url, pm)
+        for row in self.player_rows.values():
+            row.show_fetched_art(url, pm)
 
     def periodic_update(self):
-        self.refresh_player_rows()
+        """Poll every subsystem once."""
+        self._poll_players()
+        self._poll_sink_name()
+
+    def _view_state(self):
+        """What's on screen, for change detection."""
+        return (
+            tuple(self.players),
+            tuple(
+                (name, row._view)
+                for name, row in self.player_rows.items()
+            ),
+            self.volume_slider.value(),
+            self._global_muted,
+        )
+
+    def _poll_players(self):
+        """Scheduler task: player rows and default sink
+        volume/mute. Returns whether anything changed."""
+        with profiler.tick("periodic_update"):
+            before = self._view_state()
+            if not self._use_pulse:
+                self.audio.poll(sink_name=False)
+            self.refresh_player_rows()
+            self.update_volume_slider()
+            self.update_mute_button_state()
+            return self._view_state() != before
+
+    def _poll_sink_name(self):
+        """Scheduler task: the sink switch button label."""
+        with profiler.tick("poll_sink_name"):
+            before = self.switch_input_button.text()
+            self.audio.poll_sink_name()
+            self.update_input_button_text()
+            return self.switch_input_button.text() != before
+
+    def _schedule_audio_refresh(self, facility):
+        if self._audio_refresh_pending:
+            return
+        self._audio_refresh_pending = True
+        QTimer.singleShot(0, self._on_audio_changed)
+
+    def _on_audio_changed(self):
+        self._audio_refresh_pending = False
+        if self._pending_sink == self.audio.default_sink_name:
+            self._pending_sink = None
+        with profiler.tick("pulse"):
+            self.update_volume_slider()
+            self.update_input_button_text()
+            self.update_mute_button_state()
+            # Browser rows read titles and volume from sink
+            # inputs
+            self.invalidate_snapshot()
+            snap = self.snapshot()
+            for name, row in self.player_rows.items():
+                if row._is_browser:
+                    self._refresh_row(name, snap)
+            self.invalidate_snapshot()
+
+    def _refresh_audio(self):
+        """Re-read sound server state after an action. Live
+        connections get the change as an event instead."""
+        if self._use_pulse:
+            return
+        self.audio.poll()
+        self.update_volume_slider()
         self.update_input_button_text()
         self.update_mute_button_state()
 
     # --- Global controls ---
 
+    def run_command(self, job, key=None):
+        """Queue a control command on the dispatcher thread.
+        State is re-read once the queue settles."""
+        self.invalidate_snapshot()
+        self.scheduler.poke()
+        self.dispatcher.submit(job, key)
+
+    def _on_command_done(self):
+        self._settle_timer.start()
+
+    def _after_commands(self):
+        with profiler.tick("after_commands"):
+            self._pending_sink = None
+            self._refresh_audio()
+            self.refresh_player_rows()
+
     def toggle_mute(self):
-        try:
-            subprocess.run(
-                ["pactl", "set-sink-mute",
-                 "@DEFAULT_SINK@", "toggle"]
-            )
-            self.update_mute_button_state()
-        except Exception as e:
-            print(f"Error toggling mute: {e}")
+        profiler.action(
+            "mute", "@DEFAULT_SINK@",
+            lambda v, want=not self._global_muted: v == want,
+        )
+        self.actions.toggle_mute()
+        self._show_global_muted(not self._global_muted)
 
     def update_mute_button_state(self):
-        try:
-            result = subprocess.run(
-                ["pactl", "get-sink-mute", "@DEFAULT_SINK@"],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0:
-                muted = "yes" in result.stdout.lower()
-                self.mute_button.setText(
-                    "unmute" if muted else "mute"
-                )
-                self.mute_button.setStyleSheet(
-                    "QPushButton {"
-                    "  background-color: #bf616a;"
-                    "  color: #eceff4;"
-                    "  border-radius: 8px;"
-                    "  padding: 10px;"
-                    "  font-size: 10pt;"
-                    "}"
-                    "QPushButton:hover {"
-                    "  background-color: #d08770;"
-                    "}"
-                    if muted else ""
-                )
-        except Exception as e:
-            print(f"Error updating mute button state: {e}")
+        muted = self.audio.default_sink()["muted"]
+        profiler.observe("mute", "@DEFAULT_SINK@", muted)
+        self._show_global_muted(muted)
+
+    def _show_global_muted(self, muted):
+        if muted == self._global_muted:
+            return
+        self._global_muted = muted
+        self.mute_button.setText(
+            "unmute" if muted else "mute"
+        )
+        _set_style_flag(self.mute_button, "muted", muted)
+        self._save_master()
 
     def volume_up(self):
-        subprocess.run(
-            ["pactl", "set-sink-volume",
-             "@DEFAULT_SINK@", "+5%"]
+        # Moving the slider queues an absolute set-volume, so
+        # rapid presses coalesce instead of stacking up
+        self.volume_slider.setValue(
+            min(100, self.volume_slider.value() + 5)
         )
-        self.update_volume_slider()
 
     def volume_down(self):
-        subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", "-5%"])
-        self.update_volume_slider()
+        self.volume_slider.setValue(
+            max(0, self.volume_slider.value() - 5)
+        )
 
     def set_volume(self, value):
-        subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{value}%"])
+        if self._updating_volume_slider:
+            return
+        profiler.action(
+            "volume", "@DEFAULT_SINK@",
+            lambda v, want=value: v == want,
+        )
+        self.actions.set_volume(value)
 
     def update_volume_slider(self):
-        try:
-            result = subprocess.run(
-                ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0:
-                output = result.stdout
-                if "%" in output:
-                    vol_str = output.split("%")[0].split()[-1]
-                    try:
-                        self.volume_slider.setValue(
-                            int(vol_str)
-                        )
-                    except ValueError:
-                        pass
-        except Exception as e:
-            print(f"Error updating volume: {e}")
-
-    def toggle_audio_sink(self):
-        try:
-            result = subprocess.run(
-                ["pactl", "list", "sinks", "short"],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0:
-                sinks = result.stdout.strip().split('\n')
-                modi_sink = None
-                fulla_sink = None
-
-                for sink in sinks:
-                    if "Modi" in sink:
-                        modi_sink = sink.split('\t')[0]
-                    elif "Fulla" in sink:
-                        fulla_sink = sink.split('\t')[0]
-
-                default_result = subprocess.run(
-                    ["pactl", "get-default-sink"],
-                    capture_output=True, text=True,
-                )
-                current_sink = default_result.stdout.strip()
-
-                if modi_sink and fulla_sink:
-                    if "Modi" in current_sink:
-                        subprocess.run(
-                            ["pactl", "set-default-sink",
-                             fulla_sink]
-                        )
-                    else:
-                        subprocess.run(
-                            ["pactl", "set-default-sink",
-                             modi_sink]
-                        )
-                    self.move_streams_to_default_sink()
-
-                self.update_volume_slider()
-                self.update_input_button_text()
-                self.update_mute_button_state()
-        except Exception as e:
-            print(f"Error toggling audio sink: {e}")
+        vol = self.audio.default_sink()["volume"]
+        profiler.observe("volume", "@DEFAULT_SINK@", vol)
+        if vol is None or self.volume_slider.isSliderDown():
+            return
+        # Don't echo server-side changes back as set-volume
+        self._updating_volume_slider = True
+        self.volume_slider.setValue(vol)
+        self._updating_volume_slider = False
+        self._save_master()
 
-    def move_streams_to_default_sink(self):
-        try:
-            default_sink = subprocess.run(
-                ["pactl", "get-default-sink"],
-                capture_output=True, text=True,
-            ).stdout.strip()
+    def _sink_index(self):
+        return SinkIndex(self.audio.sinks.values())
 
-            streams = subprocess.run(
-                ["pactl", "list", "sink-inputs", "short"],
-                capture_output=True, text=True,
-            )
-            if (
-                streams.returncode == 0
-                and streams.stdout.strip()
-            ):
-                for stream in (
-                    streams.stdout.strip().split('\n')
-                ):
-                    stream_id = stream.split('\t')[0]
-                    subprocess.run(
-                        ["pactl", "move-sink-input",
-                         stream_id, default_sink]
-                    )
-        except Exception as e:
-            print(f"Error moving streams: {e}")
+    def toggle_audio_sink(self):
+        current = self._pending_sink or self.audio.default_sink_name
+        profile = self.router.next_profile(
+            self._sink_index(), current
+        )
+        if profile is None:
+            return
+        sink = self._sink_index().find(profile.match)
+        self._pending_sink = sink["name"] if sink else None
+        self.update_input_button_text()
+        self.actions.switch_sink(profile.name)
 
     def update_input_button_text(self):
-        try:
-            default_result = subprocess.run(
-                ["pactl", "get-default-sink"],
-                capture_output=True, text=True,
-            )
-            current_sink = default_result.stdout.strip()
-            if "Modi" in current_sink:
-                self.switch_input_button.setText(
-                    "Switch to phones"
-                )
-            elif "Fulla" in current_sink:
-                self.switch_input_button.setText(
-                    "Switch to speakers"
-                )
-            else:
-                self.switch_input_button.setText(
-                    "Switch Input"
-                )
-        except Exception:
-            self.switch_input_button.setText("Switch Input")
+        current = self._pending_sink or self.audio.default_sink_name
+        profile = self.router.next_profile(
+            self._sink_index(), current
+        )
+        label = f"Switch to {profile.name}" if profile else "Switch Input"
+        self.switch_input_button.setText(label)
+        if self.audio.default_sink_name:
+            self.state.set("sink", {
+                "default_sink": self.audio.default_sink_name,
+                "label": label,
+            })
 
 
 def debug_dump():
@@ -1016,11 +3847,14 @@ def debug_dump():
     print("PLAYERCTL PLAYERS (playerctl -l)")
     print("=" * 60)
     raw = get_players()
+    states = get_player_states()
     if not raw:
         print("  (none)")
     for p in raw:
+        status, volume = states.get(p, ("", None))
         print(f"\n  {p}")
-        print(f"    status: {get_player_status(p)}")
+        print(f"    status: {status}")
+        print(f"    volume: {volume}")
 
     print(f"\n  Total: {len(raw)}")
 
@@ -1038,12 +3872,645 @@ def debug_dump():
     print()
 
 
+# --- Daemon ---
+
+def run_daemon(args):
+    import signal
+
+    app = QCoreApplication(sys.argv[:1])
+    daemon = MediaDaemon(args.socket)
+    if not daemon.start():
+        print(f"A daemon is already serving {args.socket}")
+        return 1
+    app.aboutToQuit.connect(daemon.shutdown)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: app.quit())
+    # Python only runs signal handlers between bytecodes;
+    # wake the interpreter now and then
+    wake = QTimer()
+    wake.timeout.connect(lambda: None)
+    wake.start(500)
+    print(f"Serving on {daemon.path}")
+    return app.exec_()
+
+
+def run_ctl(args):
+    """Send one request to the daemon and print the result
+    as JSON; "subscribe" keeps printing each pushed state."""
+    import socket
+
+    op, *params = args.request or ["state"]
+    request = {"id": 1, "op": op}
+    for param in params:
+        key, sep, value = param.partition("=")
+        if not sep:
+            print(f"Expected KEY=VALUE, got {param!r}", file=sys.stderr)
+            return 2
+        try:
+            request[key] = json.loads(value)
+        except ValueError:
+            request[key] = value
+
+    sock = socket.socket(socket.AF_UNIX)
+    try:
+        sock.connect(args.socket)
+    except OSError as e:
+        print(f"No daemon at {args.socket}: {e}", file=sys.stderr)
+        return 1
+    with sock, sock.makefile("rw") as f:
+        f.write(json.dumps(request) + "\n")
+        f.flush()
+        reply = json.loads(f.readline() or "null")
+        if not reply or not reply.get("ok"):
+            error = reply.get("error") if reply else "connection closed"
+            print(f"Error: {error}", file=sys.stderr)
+            return 1
+        print(json.dumps(reply["result"]), flush=True)
+        if op != "subscribe":
+            return 0
+        try:
+            for line in f:
+                print(json.dumps(json.loads(line)["state"]), flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+# --- Benchmark harness ---
+
+# Stand-in for playerctl and pactl (dispatches on argv[0]).
+# State lives in a JSON file so the harness can churn it.
+BENCH_SHIM = r'''
+import fcntl, json, os, sys, time
+
+STATE = os.environ["MEDIA_TOUCHPAD_BENCH_STATE"]
+# Simulated sound server round trip
+time.sleep(float(os.environ.get("MEDIA_TOUCHPAD_BENCH_RTT", 0)))
+# Concurrent calls (batched moves) must not lose updates
+lock = open(STATE + ".lock", "w")
+fcntl.flock(lock, fcntl.LOCK_EX)
+with open(STATE) as f:
+    st = json.load(f)
+tool = os.path.basename(sys.argv[0])
+args = sys.argv[1:]
+out = []
+changed = False
+
+
+def save():
+    tmp = STATE + f".{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(st, f)
+    os.replace(tmp, STATE)
+
+
+def player(name):
+    for p in st["players"]:
+        if p["name"] == name:
+            return p
+    sys.exit(1)
+
+
+def pct(v):
+    return f"{round(v * 65536)} / {round(v * 100):3d}% / 0.00 dB"
+
+
+if tool == "playerctl":
+    if args == ["-l"]:
+        out = [p["name"] for p in st["players"]]
+    elif args[:2] == ["-a", "metadata"]:
+        for p in st["players"]:
+            out.append(f"{p['name']} xesam:title {p['title']}")
+            out.append(f"{p['name']} xesam:artist {p['artist']}")
+    elif args[:2] == ["-a", "status"]:
+        out = [
+            f"{p['name']}\t{p['status']}\t{p['volume']}"
+            for p in st["players"]
+        ]
+    elif args[:1] == ["-p"]:
+        p, cmd = player(args[1]), args[2]
+        if cmd == "status":
+            out = [p["status"]]
+        elif cmd == "play-pause":
+            p["status"] = (
+                "Paused" if p["status"] == "Playing" else "Playing"
+            )
+            changed = True
+        elif cmd == "next":
+            p["title"] = p["title"] + "+"
+            changed = True
+        elif cmd == "volume" and len(args) > 3:
+            p["volume"] = float(args[3])
+            changed = True
+        elif cmd == "volume":
+            out = [str(p["volume"])]
+elif tool == "pactl":
+    sis = st["sink_inputs"]
+    if args == ["-f", "json", "list", "sink-inputs"]:
+        if not st.get("pactl_json", True):
+            sys.exit(1)
+        out = [json.dumps([{
+            "index": si["id"], "sink": si["sink"],
+            "corked": si["corked"], "mute": si["muted"],
+            "volume": {ch: {
+                "value": round(si["volume"] * 65536),
+                "value_percent": f"{round(si['volume'] * 100)}%",
+                "db": "0.00 dB",
+            } for ch in ("front-left", "front-right")},
+            "properties": {
+                "media.name": si["media_name"],
+                "application.process.binary": si["binary"],
+            },
+        } for si in sis])]
+    elif args == ["list", "sink-inputs"]:
+        for si in sis:
+            v = pct(si["volume"])
+            out += [
+                f"Sink Input #{si['id']}",
+                "\tDriver: protocol-native.c",
+                f"\tSink: {si['sink']}",
+                f"\tCorked: {'yes' if si['corked'] else 'no'}",
+                f"\tMute: {'yes' if si['muted'] else 'no'}",
+                f"\tVolume: front-left: {v},   front-right: {v}",
+                "\t        balance 0.00",
+                "\tProperties:",
+                f'\t\tmedia.name = "{si["media_name"]}"',
+                f'\t\tapplication.process.binary = "{si["binary"]}"',
+                "",
+            ]
+    elif args == ["list", "sink-inputs", "short"]:
+        out = [f"{si['id']}\t{si['sink']}\t0\t-\ts16le" for si in sis]
+    elif args == ["-f", "json", "list", "sinks"]:
+        if not st.get("pactl_json", True):
+            sys.exit(1)
+        out = [json.dumps([{
+            "index": k["index"], "name": k["name"],
+            "description": k["name"].split(".")[-1],
+            "properties": {"device.product.name": k["name"]},
+        } for k in st["sinks"]])]
+    elif args == ["list", "sinks", "short"]:
+        out = [f"{k['index']}\t{k['name']}\tmodule\tRUNNING"
+               for k in st["sinks"]]
+    elif args == ["get-default-sink"]:
+        out = [st["default_sink"]]
+    elif args[:1] == ["get-sink-volume"]:
+        v = pct(st["sink_volume"])
+        out = [f"Volume: front-left: {v},   front-right: {v}"]
+    elif args[:1] == ["get-sink-mute"]:
+        out = [f"Mute: {'yes' if st['sink_muted'] else 'no'}"]
+    elif args[:1] == ["set-sink-volume"]:
+        st["sink_volume"] = int(args[2].rstrip("%")) / 100
+        changed = True
+    elif args[:1] == ["set-sink-mute"]:
+        st["sink_muted"] = not st["sink_muted"]
+        changed = True
+    elif args[:1] in (["set-sink-input-volume"], ["set-sink-input-mute"]):
+        for si in sis:
+            if str(si["id"]) == args[1]:
+                if args[0] == "set-sink-input-mute":
+                    si["muted"] = not si["muted"]
+                else:
+                    si["volume"] = int(args[2].rstrip("%")) / 100
+        changed = True
+    elif args[:1] == ["set-default-sink"]:
+        st["default_sink"] = args[1]
+        changed = True
+    elif args[:1] == ["move-sink-input"]:
+        for si in sis:
+            if str(si["id"]) == args[1]:
+                si["sink"] = next(
+                    k["index"] for k in st["sinks"]
+                    if k["name"] == args[2]
+                )
+        changed = True
+
+if changed:
+    save()
+if out:
+    print("\n".join(out))
+'''
+
+
+def _bench_state(n_players, n_sink_inputs):
+    """Initial stand-in state: a mix of plain players and
+    browser instances, with sink inputs spread across them."""
+    players = []
+    for i in range(n_players):
+        name = (
+            f"firefox.instance_{i}" if i % 3 == 0
+            else f"player{i}"
+        )
+        players.append({
+            "name": name, "status": "Paused", "volume": 0.8,
+            "title": f"Track {i}", "artist": f"Artist {i}",
+        })
+    binaries = [p["name"].split(".")[0] for p in players] or ["mpv"]
+    sink_inputs = [{
+        "id": 100 + i, "binary": binaries[i % len(binaries)],
+        "media_name": f"Stream {i}", "volume": 0.7,
+        "muted": False, "corked": i % 2 == 1, "sink": 1,
+    } for i in range(n_sink_inputs)]
+    return {
+        "players": players, "sink_inputs": sink_inputs,
+        "sinks": [
+            {"index": 1, "name": "alsa_output.Schiit_Modi"},
+            {"index": 2, "name": "alsa_output.Schiit_Fulla"},
+        ],
+        "default_sink": "alsa_output.Schiit_Modi",
+        "sink_volume": 0.5, "sink_muted": False,
+    }
+
+
+def _write_bench_env(directory, state):
+    """Write stand-in executables and state; return the
+    environment that routes playerctl/pactl to them."""
+    state_path = os.path.join(directory, "state.json")
+    with open(state_path, "w") as f:
+        json.dump(state, f)
+    shim = f"#!{sys.executable} -S\n" + BENCH_SHIM
+    for tool in ("playerctl", "pactl"):
+        path = os.path.join(directory, tool)
+        with open(path, "w") as f:
+            f.write(shim)
+        os.chmod(path, 0o755)
+    return {
+        "PATH": directory + os.pathsep + os.environ.get("PATH", ""),
+        "MEDIA_TOUCHPAD_BENCH_STATE": state_path,
+    }
+
+
+def _churn(state_path, rng, fraction=0.25):
+    """Flip status/title of some players and cork state of
+    some streams, like tabs starting and stopping."""
+    import fcntl
+
+    lock = open(state_path + ".lock", "w")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    with open(state_path) as f:
+        st = json.load(f)
+    for p in st["players"]:
+        if rng.random() < fraction:
+            p["status"] = rng.choice(["Playing", "Paused"])
+            p["title"] = f"Track {rng.randrange(10_000)}"
+    for si in st["sink_inputs"]:
+        if rng.random() < fraction:
+            si["corked"] = not si["corked"]
+    tmp = state_path + ".churn"
+    with open(tmp, "w") as f:
+        json.dump(st, f)
+    os.replace(tmp, state_path)
+    lock.close()
+
+
+def run_benchmark(args):
+    """Drive MediaController headless against stand-in
+    playerctl/pactl and report throughput and costs."""
+    import tempfile
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Holds the stand-ins and their state; removed afterwards
+    with tempfile.TemporaryDirectory(
+        prefix="media-touchpad-bench-"
+    ) as workdir:
+        return _run_benchmark_in(workdir, args)
+
+
+def _run_benchmark_in(workdir, args):
+    import random
+    import resource
+
+    os.environ.update(_write_bench_env(
+        workdir, _bench_state(args.players, args.sink_inputs)
+    ))
+    state_path = os.environ["MEDIA_TOUCHPAD_BENCH_STATE"]
+    rng = random.Random(args.seed)
+
+    profiler.enable()
+    app = QApplication(sys.argv[:1])
+    window = MediaController(live=False)
+    window.show()
+    while not window.is_live:
+        app.processEvents()
+    window.scheduler.stop()
+    profiler.ticks.clear()
+    forks_before = profiler.total_forks
+
+    ticks = 0
+    blocked = 0.0
+    worst = 0.0
+    next_churn = 0.0
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        if args.churn and now >= next_churn:
+            _churn(state_path, rng)
+            next_churn = now + 1.0 / args.churn
+        t0 = time.perf_counter()
+        window.periodic_update()
+        app.processEvents()
+        dt = time.perf_counter() - t0
+        blocked += dt
+        worst = max(worst, dt)
+        ticks += 1
+    wall = time.perf_counter() - start
+    window.shutdown()
+
+    summary = profiler.summary()
+    result = {
+        "players": args.players,
+        "sink_inputs": args.sink_inputs,
+        "churn_hz": args.churn,
+        "seconds": round(wall, 2),
+        "ticks": ticks,
+        "ticks_per_sec": round(ticks / wall, 2),
+        "forks_per_tick": round(
+            (profiler.total_forks - forks_before) / max(ticks, 1), 2
+        ),
+        "tick_ms_p50": round(summary["tick_ms"]["p50"], 2),
+        "tick_ms_p95": round(summary["tick_ms"]["p95"], 2),
+        "ui_blocked_ms_max": round(worst * 1000, 2),
+        "ui_blocked_ms_per_tick": round(blocked * 1000 / max(ticks, 1), 2),
+        # Linux reports KiB
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "phases_ms_p50": {
+            k: round(v["p50"], 2) for k, v in summary["phases"].items()
+        },
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print(f"{key:24s} {value}")
+
+    failed = []
+    if (args.max_forks_per_tick is not None
+            and result["forks_per_tick"] > args.max_forks_per_tick):
+        failed.append("forks_per_tick")
+    if (args.max_tick_ms is not None
+            and result["tick_ms_p95"] > args.max_tick_ms):
+        failed.append("tick_ms_p95")
+    if failed:
+        print(f"Benchmark budget exceeded: {', '.join(failed)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def _synthetic_sink_inputs(n):
+    """Text and JSON listings of `n` browser-ish streams."""
+    text, objs = [], []
+    for i in range(n):
+        binary = ("firefox", "chromium", "mpv", "spotify")[i % 4]
+        pct = 30 + i % 70
+        raw = round(pct / 100 * 65536)
+        corked = "yes" if i % 3 else "no"
+        text += [
+            f"Sink Input #{1000 + i}",
+            f"\tDriver: protocol-native.c",
+            f"\tOwner Module: {i % 7}",
+            f"\tClient: {i * 2}",
+            f"\tSink: {i % 2 + 1}",
+            f"\tSample Specification: s16le 2ch 44100Hz",
+            f"\tChannel Map: front-left,front-right",
+            f"\tFormat: pcm, format.sample_format = \"\\\"s16le\\\"\"",
+            f"\tCorked: {corked}",
+            f"\tMute: no",
+            f"\tVolume: front-left: {raw} / {pct:3d}% / -9.03 dB,"
+            f"   front-right: {raw} / {pct:3d}% / -9.03 dB",
+            f"\t        balance 0.00",
+            f"\tBuffer Latency: 113151 usec",
+            f"\tSink Latency: 23442 usec",
+            f"\tResample method: speex-float-1",
+            f"\tProperties:",
+            f'\t\tmedia.name = "Tab {i} - YouTube"',
+            f'\t\tapplication.name = "{binary.title()}"',
+            f'\t\tnative-protocol.peer = "UNIX socket client"',
+            f'\t\tapplication.process.id = "{4000 + i}"',
+            f'\t\tapplication.process.user = "user"',
+            f'\t\tapplication.process.binary = "{binary}"',
+            f'\t\tmodule-stream-restore.id = "sink-input-by-app"',
+            "",
+        ]
+        objs.append({
+            "index": 1000 + i, "sink": i % 2 + 1,
+            "corked": corked == "yes", "mute": False,
+            "volume": {ch: {
+                "value": raw, "value_percent": f"{pct}%",
+                "db": "-9.03 dB",
+            } for ch in ("front-left", "front-right")},
+            "properties": {
+                "media.name": f"Tab {i} - YouTube",
+                "application.process.binary": binary,
+            },
+        })
+    return "\n".join(text) + "\n", json.dumps(objs)
+
+
+def _parse_sink_inputs_regex(text):
+    """The original per-line regex parser, kept as the
+    baseline for the parser benchmark."""
+    entries = []
+    cur = None
+    for line in text.splitlines():
+        m = re.match(r"Sink Input #(\d+)", line)
+        if m:
+            if cur:
+                entries.append(cur)
+            cur = {
+                "id": m.group(1), "binary": "",
+                "media_name": "", "volume": 100,
+                "muted": False, "corked": False,
+            }
+            continue
+        if cur is None:
+            continue
+        stripped = line.strip()
+        if stripped.startswith("Volume:"):
+            vm = re.search(r"(\d+)%", stripped)
+            if vm:
+                cur["volume"] = int(vm.group(1))
+        elif stripped.startswith(("Muted:", "Mute:")):
+            cur["muted"] = "yes" in stripped.lower()
+        elif stripped.startswith(("Corked:", "Cork:")):
+            cur["corked"] = "yes" in stripped.lower()
+        elif stripped.startswith("application.process.binary"):
+            cur["binary"] = (
+                stripped.split("=", 1)[-1].strip().strip('"')
+            )
+        elif stripped.startswith("media.name"):
+            cur["media_name"] = (
+                stripped.split("=", 1)[-1].strip().strip('"')
+            )
+    if cur:
+        entries.append(cur)
+    return entries
+
+
+def run_parser_benchmark(args):
+    """Time the regex baseline against the streaming text
+    and JSON parsers on synthetic listings."""
+    def best_of(fn):
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - t0)
+        return min(times) * 1000, result
+
+    def key(si):
+        if isinstance(si, dict):
+            return (si["id"], si["binary"], si["media_name"],
+                    si["volume"], si["muted"], si["corked"])
+        return (si.id, si.binary, si.media_name,
+                si.volume, si.muted, si.corked)
+
+    results = []
+    for n in (1_000, 10_000):
+        text, data = _synthetic_sink_inputs(n)
+        lines = text.splitlines(keepends=True)
+        regex_ms, baseline = best_of(
+            lambda: _parse_sink_inputs_regex(text)
+        )
+        stream_ms, streamed = best_of(
+            lambda: list(_parse_sink_input_lines(lines))
+        )
+        json_ms, from_json = best_of(
+            lambda: _parse_sink_input_json(json.loads(data))
+        )
+        expected = [key(si) for si in baseline]
+        results.append({
+            "streams": n,
+            "lines": len(lines),
+            "regex_ms": round(regex_ms, 2),
+            "stream_ms": round(stream_ms, 2),
+            "json_ms": round(json_ms, 2),
+            "speedup": round(regex_ms / stream_ms, 2),
+            "identical": (
+                [key(si) for si in streamed] == expected
+                and [key(si) for si in from_json] == expected
+            ),
+        })
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print("  ".join(f"{k}={v}" for k, v in r.items()))
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+MODES = ["debug", "daemon", "ctl", "bench", "bench-parser"]
+
+
+def parse_args(argv):
+    """Parse our options; anything unknown is left for Qt.
+
+    A mode has to come first. Without one, only options are
+    parsed, so the values of Qt options (-platform xcb) aren't
+    taken for a mode."""
+    window = not (argv and argv[0] in MODES) and not (
+        {"-h", "--help"} & set(argv)
+    )
+    parser = argparse.ArgumentParser(
+        description="Touchscreen media player and audio "
+        "output controller.",
+        epilog="A mode goes first; without one the window "
+        "opens, and arguments not listed here (such as "
+        "-platform xcb) are passed on to Qt.",
+    )
+    if window:
+        parser.set_defaults(mode=None, request=[])
+    else:
+        parser.add_argument(
+            "mode", nargs="?", choices=MODES,
+            help="debug: print raw playerctl state and exit; "
+            "daemon: serve player/sink state and actions on a "
+            "socket for windows and scripts to share; "
+            "ctl: send one request to the daemon; "
+            "bench: run headless against stand-in "
+            "playerctl/pactl; "
+            "bench-parser: time the sink input parsers",
+        )
+        parser.add_argument(
+            "request", nargs="*", metavar="ARG",
+            help="ctl: an op (state, subscribe, play-pause, "
+            "next, player-volume, player-mute, volume, mute, "
+            "switch-sink) and its KEY=VALUE arguments, e.g. "
+            "player-volume player=spotify volume=40",
+        )
+    parser.add_argument(
+        "--socket", default=DAEMON_SOCKET,
+        help=f"daemon socket (default: {DAEMON_SOCKET})",
+    )
+    parser.add_argument(
+        "--standalone", action="store_true",
+        help="don't use a running daemon; watch players and "
+        "sinks in this window",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", metavar="TRACE",
+        const="media-touchpad-trace.json",
+        help="show a timing overlay and write a JSON trace "
+        "(Chrome/Perfetto format) on exit",
+    )
+    parser.add_argument(
+        "--startup-trace", action="store_true",
+        help="print import and init timings to stderr once "
+        "live state is on screen",
+    )
+    bench = parser.add_argument_group("bench options")
+    bench.add_argument("--players", type=int, default=6,
+                       help="simulated MPRIS players (default: 6)")
+    bench.add_argument("--sink-inputs", type=int, default=12,
+                       help="simulated sink inputs (default: 12)")
+    bench.add_argument("--churn", type=float, default=2.0,
+                       help="state changes per second (default: 2)")
+    bench.add_argument("--seconds", type=float, default=10.0,
+                       help="benchmark duration (default: 10)")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--repeat", type=int, default=5,
+                       help="bench-parser: runs per parser, best "
+                       "is reported (default: 5)")
+    bench.add_argument("--json", action="store_true",
+                       help="print results as JSON")
+    bench.add_argument("--max-forks-per-tick", type=float,
+                       help="exit 1 if forks per tick exceed this")
+    bench.add_argument("--max-tick-ms", type=float,
+                       help="exit 1 if p95 tick time exceeds this")
+    return parser.parse_known_intermixed_args(argv)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "debug":
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.mode == "debug":
         debug_dump()
         sys.exit(0)
+    if args.mode == "daemon":
+        sys.exit(run_daemon(args))
+    if args.mode == "ctl":
+        sys.exit(run_ctl(args))
+    if args.mode == "bench":
+        sys.exit(run_benchmark(args))
+    if args.mode == "bench-parser":
+        sys.exit(run_parser_benchmark(args))
 
-    app = QApplication(sys.argv)
-    window = MediaController()
+    if args.profile:
+        profiler.enable()
+    startup.enabled = args.startup_trace
+    startup.mark("module loaded")
+
+    with startup.span("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with startup.span("build window"):
+        window = MediaController(
+            daemon=None if args.standalone else args.socket
+        )
     window.show()
-    sys.exit(app.exec_())
+    startup.mark("show")
+    code = app.exec_()
+    if args.profile:
+        profiler.export(args.profile)
+        print(f"Wrote profile trace to {args.profile}")
+    sys.exit(code)